@@ -35,11 +35,12 @@ CHANNEL_IDS = [
 
 
 def get_channel_id_from_video_id(video_id: str, youtube) -> Optional[str]:
-    """動画IDからチャンネルIDを取得"""
+    """動画IDからチャンネルIDを取得（複数ある場合はbuild_video_to_channel_mapで50件ずつまとめて取得する）"""
     try:
         request = youtube.videos().list(
             part='snippet',
-            id=video_id
+            id=video_id,
+            fields='items(snippet/channelId)'
         )
         response = request.execute()
         
@@ -148,15 +149,21 @@ def is_non_song_entry(song_title: str, artist: str = '', confidence_score: float
     return False
 
 
-def build_video_to_channel_map(timestamps: list, youtube) -> Dict[str, str]:
-    """動画IDからチャンネルIDへのマッピングを作成"""
+def build_video_to_channel_map(timestamps: list, youtube, known: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """動画IDからチャンネルIDへのマッピングを作成
+
+    Args:
+        timestamps: タイムスタンプのリスト
+        youtube: YouTube APIクライアント
+        known: 既に判明している動画ID→チャンネルID（APIで再取得しない）
+    """
     print('\n[*] 動画IDからチャンネルIDを取得中...')
     
-    # ユニークな動画IDを取得
-    unique_video_ids = list(set([ts['動画ID'] for ts in timestamps if ts.get('動画ID')]))
-    print(f'   ユニークな動画数: {len(unique_video_ids)}')
+    video_to_channel = dict(known) if known else {}
     
-    video_to_channel = {}
+    # ユニークな動画IDのうち、チャンネルIDが未判明のものだけを取得
+    unique_video_ids = list({ts['動画ID'] for ts in timestamps if ts.get('動画ID')} - video_to_channel.keys())
+    print(f'   ユニークな動画数: {len(unique_video_ids)}（既知: {len(video_to_channel)}）')
     
     # YouTube APIは1リクエストで最大50動画取得可能
     batch_size = 50
@@ -167,7 +174,8 @@ def build_video_to_channel_map(timestamps: list, youtube) -> Dict[str, str]:
         try:
             request = youtube.videos().list(
                 part='snippet',
-                id=','.join(batch)
+                id=','.join(batch),
+                fields='items(id,snippet/channelId)'
             )
             response = request.execute()
             
@@ -242,11 +250,18 @@ def csv_to_json(csv_input: str, json_output: str, mode_name: str = ""):
                 'タイムスタンプ': row.get('タイムスタンプ', ''),
                 '配信日': row.get('配信日', ''),
                 '動画ID': row.get('動画ID', ''),
-                '確度スコア': row.get('確度スコア', '')
+                '確度スコア': row.get('確度スコア', ''),
+                'チャンネルID': row.get('チャンネルID', '')
             })
 
     print(f'[OK] CSVから{len(new_timestamps)}件のタイムスタンプを読み込みました（{filtered_count}件を除外）')
 
+    # 既存データ・CSVで既にチャンネルIDが分かっている動画はAPIで再取得しない
+    known_channels = {}
+    for ts in existing_timestamps + new_timestamps:
+        if ts.get('動画ID') and ts.get('チャンネルID'):
+            known_channels[ts['動画ID']] = ts['チャンネルID']
+
     # 既存データと新データをマージ（重複を除去）
     # キーは「動画ID + タイムスタンプ + 曲名」で一意性を判定
     merged_map = {}
@@ -271,10 +286,10 @@ def csv_to_json(csv_input: str, json_output: str, mode_name: str = ""):
     api_key = os.getenv('API_KEY')
     if not api_key:
         print('[!] API_KEYが設定されていません。チャンネルIDを取得できません。')
-        video_to_channel = {}
+        video_to_channel = known_channels
     else:
         youtube = build('youtube', 'v3', developerKey=api_key)
-        video_to_channel = build_video_to_channel_map(timestamps, youtube)
+        video_to_channel = build_video_to_channel_map(timestamps, youtube, known_channels)
     
     # チャンネルIDを追加
     for ts in timestamps:
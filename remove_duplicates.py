@@ -9,15 +9,15 @@ from collections import defaultdict
 from typing import List, Dict, Tuple
 
 
-def detect_duplicates(csv_path: str) -> Tuple[List[Dict], List[Dict]]:
+def load_csv(csv_path: str) -> Tuple[List[str], List[Dict]]:
     """
-    CSVファイルから重複を検出
+    CSVファイルを1回だけ読み込む
 
     Args:
         csv_path: CSVファイルのパス
 
     Returns:
-        (ユニーク行のリスト, 重複行のリスト)
+        (ヘッダー, 行のリスト)
     """
     if not os.path.exists(csv_path):
         print(f'[!] ファイルが見つかりません: {csv_path}')
@@ -25,15 +25,26 @@ def detect_duplicates(csv_path: str) -> Tuple[List[Dict], List[Dict]]:
 
     print(f'\n[*] CSVファイルを読み込み中: {csv_path}')
 
-    rows = []
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
         reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        for row in reader:
-            rows.append(row)
+        rows = list(reader)
+        fieldnames = reader.fieldnames or []
 
     print(f'[OK] {len(rows)}行を読み込みました')
 
+    return fieldnames, rows
+
+
+def split_duplicates(rows: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    読み込み済みの行から重複を検出
+
+    Args:
+        rows: CSVの行のリスト
+
+    Returns:
+        (ユニーク行のリスト, 重複行のリスト)
+    """
     # 重複判定のキー: (曲名, タイムスタンプ, 動画ID)
     seen = {}
     unique_rows = []
@@ -64,6 +75,20 @@ def detect_duplicates(csv_path: str) -> Tuple[List[Dict], List[Dict]]:
     return unique_rows, duplicate_rows
 
 
+def detect_duplicates(csv_path: str) -> Tuple[List[Dict], List[Dict]]:
+    """
+    CSVファイルから重複を検出
+
+    Args:
+        csv_path: CSVファイルのパス
+
+    Returns:
+        (ユニーク行のリスト, 重複行のリスト)
+    """
+    _, rows = load_csv(csv_path)
+    return split_duplicates(rows)
+
+
 def remove_duplicates(csv_path: str, output_path: str = None) -> bool:
     """
     CSVファイルから重複を除去
@@ -75,7 +100,9 @@ def remove_duplicates(csv_path: str, output_path: str = None) -> bool:
     Returns:
         成功したかどうか
     """
-    unique_rows, duplicate_rows = detect_duplicates(csv_path)
+    # ヘッダーと行を1回の読み込みで取得
+    fieldnames, rows = load_csv(csv_path)
+    unique_rows, duplicate_rows = split_duplicates(rows)
 
     if not unique_rows:
         print('[!] データがありません')
@@ -101,11 +128,6 @@ def remove_duplicates(csv_path: str, output_path: str = None) -> bool:
     # CSVに書き出し
     print(f'\n[*] CSVを出力中: {output_path}')
 
-    # 元のヘッダーを読み込む
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-
     # Noを振り直す
     for i, row in enumerate(unique_rows, 1):
         row['No'] = str(i)
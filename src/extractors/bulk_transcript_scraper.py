@@ -3,11 +3,16 @@
 """
 import csv
 import json
+import os
 from transcript_only_scraper import TranscriptOnlyScraper
 from enhanced_extractor import Config
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
+# 同時に処理する動画数（字幕取得はネットワーク待ちが大半のためスレッドで重ねる）
+MAX_WORKERS = 4
+
 def get_video_ids_from_channel():
     """チャンネルから歌枠動画IDのリストを取得（手動入力版）"""
     print("歌枠動画のIDまたはURLを入力してください（1行に1つ、空行で終了）:")
@@ -33,6 +38,19 @@ def get_video_ids_from_channel():
     
     return video_ids
 
+def process_video(scraper, video_id):
+    """1動画分の字幕取得と楽曲抽出（ワーカースレッドで実行）
+
+    YouTubeTranscriptApiのクライアントはget_transcript内で呼び出しごとに
+    生成されるため、スレッド間で共有されない。
+    """
+    songs = scraper.scrape_single_video(f"https://youtu.be/{video_id}")
+
+    # API制限回避のため少し待機（ワーカーごと）
+    time.sleep(1)
+
+    return songs
+
 def scrape_all_singing_videos():
     """全ての歌枠動画から楽曲情報を抽出"""
     config = Config()
@@ -65,94 +83,78 @@ def scrape_all_singing_videos():
     
     print(f"\n{len(video_ids)}個の動画を処理します...")
     
-    all_songs = []
     processed_count = 0
     failed_count = 0
+    song_count = 0
+    genres = {}
+    confidence_levels = {'高': 0, '中': 0, '低': 0}
     
-    for i, video_id in enumerate(video_ids, 1):
-        print(f"\n[{i}/{len(video_ids)}] 処理中: {video_id}")
-        
-        try:
-            # 楽曲情報を抽出
-            songs = scraper.scrape_single_video(f"https://youtu.be/{video_id}")
-            
-            if songs:
-                all_songs.extend(songs)
-                processed_count += 1
-                print(f"  ✓ {len(songs)}件の楽曲を抽出")
-            else:
-                print("  ✗ 楽曲が見つかりませんでした")
-                failed_count += 1
-            
-            # API制限回避のため少し待機
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"  ✗ エラー: {e}")
-            failed_count += 1
+    # 結果は抽出でき次第CSVへ書き出し、メモリには統計用の件数だけを残す
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"bulk_songs_{timestamp}.csv"
     
-    # 結果をCSVに保存
-    if all_songs:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"bulk_songs_{timestamp}.csv"
+    with open(output_file, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['No', '動画ID', 'タイムスタンプ', '曲名', 'アーティスト', '検索用', 'ジャンル', '信頼度', '元テキスト'])
         
-        with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['No', '動画ID', 'タイムスタンプ', '曲名', 'アーティスト', '検索用', 'ジャンル', '信頼度', '元テキスト']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for i, song in enumerate(all_songs, 1):
+        # 動画ごとの取得を並列化し、入力順に揃えてから書き出す
+        pending = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(process_video, scraper, video_id): index
+                for index, video_id in enumerate(video_ids)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                video_id = video_ids[index]
+                print(f"\n[{done}/{len(video_ids)}] 処理完了: {video_id}")
+                
+                songs = []
                 try:
-                    writer.writerow({
-                        'No': i,
-                        '動画ID': song['video_id'],
-                        'タイムスタンプ': song['timestamp'],
-                        '曲名': song['title'],
-                        'アーティスト': song['artist'],
-                        '検索用': song['search_term'],
-                        'ジャンル': song['genre'],
-                        '信頼度': song['confidence'],
-                        '元テキスト': song['original_text'][:50] + '...' if len(song['original_text']) > 50 else song['original_text']
-                    })
-                except UnicodeEncodeError:
-                    # エンコードエラーの場合は簡略化
-                    writer.writerow({
-                        'No': i,
-                        '動画ID': song['video_id'],
-                        'タイムスタンプ': song['timestamp'],
-                        '曲名': '[エンコードエラー]',
-                        'アーティスト': '[エンコードエラー]',
-                        '検索用': '[エンコードエラー]',
-                        'ジャンル': song['genre'],
-                        '信頼度': song['confidence'],
-                        '元テキスト': '[エンコードエラー]'
-                    })
-        
+                    # 楽曲情報を抽出
+                    songs = future.result()
+                    
+                    if songs:
+                        processed_count += 1
+                        print(f"  ✓ {len(songs)}件の楽曲を抽出")
+                    else:
+                        print("  ✗ 楽曲が見つかりませんでした")
+                        failed_count += 1
+                
+                except Exception as e:
+                    print(f"  ✗ エラー: {e}")
+                    failed_count += 1
+                
+                pending[index] = songs or []
+                while next_index in pending:
+                    for song in pending.pop(next_index):
+                        song_count += 1
+                        write_song_row(writer, song_count, song)
+                        
+                        # ジャンル統計
+                        genre = song.get('genre', 'その他')
+                        genres[genre] = genres.get(genre, 0) + 1
+                        
+                        # 信頼度統計
+                        conf = song.get('confidence', 0.5)
+                        if conf >= 0.7:
+                            confidence_levels['高'] += 1
+                        elif conf >= 0.5:
+                            confidence_levels['中'] += 1
+                        else:
+                            confidence_levels['低'] += 1
+                    next_index += 1
+    
+    if song_count:
         print(f"\n=== 処理完了 ===")
         print(f"処理成功: {processed_count}動画")
         print(f"処理失敗: {failed_count}動画") 
-        print(f"抽出楽曲: {len(all_songs)}件")
+        print(f"抽出楽曲: {song_count}件")
         print(f"保存先: {output_file}")
         
         # 統計情報
         print(f"\n=== 統計情報 ===")
-        genres = {}
-        confidence_levels = {'高': 0, '中': 0, '低': 0}
-        
-        for song in all_songs:
-            # ジャンル統計
-            genre = song.get('genre', 'その他')
-            genres[genre] = genres.get(genre, 0) + 1
-            
-            # 信頼度統計
-            conf = song.get('confidence', 0.5)
-            if conf >= 0.7:
-                confidence_levels['高'] += 1
-            elif conf >= 0.5:
-                confidence_levels['中'] += 1
-            else:
-                confidence_levels['低'] += 1
-        
         print("ジャンル別:")
         for genre, count in sorted(genres.items(), key=lambda x: x[1], reverse=True):
             print(f"  {genre}: {count}件")
@@ -162,8 +164,39 @@ def scrape_all_singing_videos():
             print(f"  {level}: {count}件")
     
     else:
+        # 1件も無ければ空のCSVは残さない
+        os.remove(output_file)
         print("\n楽曲が1件も抽出されませんでした。")
 
+def write_song_row(writer, no, song):
+    """楽曲1件をCSVに書き出す"""
+    original_text = song['original_text']
+    try:
+        writer.writerow([
+            no,
+            song['video_id'],
+            song['timestamp'],
+            song['title'],
+            song['artist'],
+            song['search_term'],
+            song['genre'],
+            song['confidence'],
+            original_text[:50] + '...' if len(original_text) > 50 else original_text
+        ])
+    except UnicodeEncodeError:
+        # エンコードエラーの場合は簡略化
+        writer.writerow([
+            no,
+            song['video_id'],
+            song['timestamp'],
+            '[エンコードエラー]',
+            '[エンコードエラー]',
+            '[エンコードエラー]',
+            song['genre'],
+            song['confidence'],
+            '[エンコードエラー]'
+        ])
+
 def create_sample_video_list():
     """サンプルの動画リストファイルを作成"""
     sample_content = """# 歌枠動画IDリスト
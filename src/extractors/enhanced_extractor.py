@@ -3,6 +3,50 @@ import re
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 
+# クリーニング・アーティスト名整形用の正規表現（呼び出しごとのコンパイルを避ける）
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+_ARTIST_COVER_RE = re.compile(r'\([^)]*cover[^)]*\)', re.IGNORECASE)
+_ARTIST_VERSION_RE = re.compile(r'\([^)]*version[^)]*\)', re.IGNORECASE)
+_ARTIST_LEADING_SYMBOLS_RE = re.compile(r'^[・･\-\s]+')
+_ARTIST_TRAILING_SYMBOLS_RE = re.compile(r'[・･\-\s]+$')
+
+# タイムスタンプ抽出・妥当性チェック用の正規表現（行・コメントごとに呼ばれるため事前にコンパイル）
+_HTML_TIMESTAMP_RES = tuple(re.compile(p, re.MULTILINE | re.DOTALL) for p in (
+    r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*([^<\n]+)',
+    r'(\d{1,2}:\d{2}(?::\d{2})?)(?:</a>)?\s*([^<\n\r]+?)(?=\s*<|$)',
+    r'<a[^>]*href="[^"]*[&?]t=\d+"[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*(.+?)(?=<|$)'
+))
+# 設定ファイルのパターンに追加する汎用パターン（曲名のみにも対応）
+_ADDITIONAL_TIMESTAMP_PATTERNS = (
+    r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–—:：・･]\s*(.+?)(?=\n|$)',
+    r'(\d{1,2}:\d{2}(?::\d{2})?)\s+(.+?)(?=\n|\d{1,2}:\d{2}|$)',
+    r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[）)]\s*(.+?)(?=\n|$)',
+    r'(\d{1,2}:\d{2}(?::\d{2})?)\s*(.+?)(?=\s+\d{1,2}:\d{2}|\n|$)',
+    # 曲名のみのパターンを追加
+    r'(\d{1,2}:\d{2}(?::\d{2})?)\s*(.+?)$',  # 行末まで
+    r'(\d{1,2}:\d{2}(?::\d{2})?)[\s\t]*(.+?)(?=\s*\d{1,2}:\d{2}|$)',  # より柔軟
+    r'(\d{1,2}:\d{2}(?::\d{2})?)[^\w]*(.+?)(?=\n|$)',  # 記号区切りも許可
+)
+# 必要最小限の除外パターン（いずれかに一致すれば無効）
+_CRITICAL_INVALID_RE = re.compile('|'.join(f'(?:{p})' for p in (
+    r'^https?://',  # URLは除外
+    r'UCY85ViSyTU5Wy_bwsUVjkdA',  # チャンネルIDは除外
+    r'youtube\.com/watch',  # YouTube URLは除外
+    r'^www\.',
+    r'href=',
+    r'</a>',
+    r'<a ',
+)), re.IGNORECASE)
+# 明らかに楽曲でないもの（いずれかに一致すれば無効）
+_NON_MUSIC_RE = re.compile('|'.join(f'(?:{p})' for p in (
+    r'^(おつ|お疲|ありがと|thank|thanks|good|nice|www|ww|w$)',
+    r'^(配信|stream|chat|コメ|comment|次|next)',
+    r'^[0-9]+$',  # 数字のみは除外
+    r'^[!@#$%^&*()_+={}[\]:";\'<>?,./~`-]+$',  # 記号のみは除外
+)), re.IGNORECASE)
+_TEXT_CHAR_RE = re.compile(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 @dataclass
 class Config:
     def __init__(self, config_path: str = "config.json"):
@@ -29,6 +73,7 @@ class EnhancedTextCleaner:
     def __init__(self, config: Config):
         self.config = config
         self.cleaning_config = config.text_cleaning
+        self.numbering_res = [re.compile(p) for p in self.cleaning_config.get('numbering_patterns', [])]
     
     def normalize_characters(self, text: str) -> str:
         """全角文字を半角に正規化"""
@@ -40,7 +85,7 @@ class EnhancedTextCleaner:
     def remove_html_tags(self, text: str) -> str:
         """HTMLタグとエスケープ文字を除去"""
         # 全てのHTMLタグを除去（より包括的）
-        text = re.sub(r'<[^>]*>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         # HTMLエスケープ文字を元に戻す
         text = text.replace('&amp;', '&')
@@ -54,9 +99,8 @@ class EnhancedTextCleaner:
     
     def remove_numbering(self, text: str) -> str:
         """先頭のナンバリングを除去"""
-        patterns = self.cleaning_config.get('numbering_patterns', [])
-        for pattern in patterns:
-            text = re.sub(pattern, '', text)
+        for pattern_re in self.numbering_res:
+            text = pattern_re.sub('', text)
         return text.strip()
     
     def clean_text(self, text: str) -> str:
@@ -80,20 +124,30 @@ class EnhancedTimestampExtractor:
         self.config = config
         self.extraction_config = config.timestamp_extraction
         self.text_cleaner = EnhancedTextCleaner(config)
+        # プレーンテキスト用パターン（テキスト全体用・行ごと用）は初回使用時にコンパイルする
+        self._plain_text_res = None
+        self._plain_line_res = None
+    
+    def _plain_timestamp_res(self):
+        """プレーンテキスト用パターンをコンパイル済みで返す（テキスト全体用, 行ごと用）"""
+        if self._plain_text_res is None:
+            patterns = [
+                self.extraction_config['patterns']['plain_timestamp'],
+                self.extraction_config['patterns']['flexible_timestamp'],
+                self.extraction_config['patterns']['japanese_timestamp']
+            ]
+            all_patterns = patterns + list(_ADDITIONAL_TIMESTAMP_PATTERNS)
+            self._plain_line_res = [re.compile(p) for p in all_patterns]
+            self._plain_text_res = [re.compile(p, re.MULTILINE | re.DOTALL) for p in all_patterns]
+        return self._plain_text_res, self._plain_line_res
     
     def extract_html_timestamps(self, text: str) -> List[Tuple[str, str]]:
         """HTMLアンカー形式のタイムスタンプを抽出"""
         results = []
         
         # より柔軟なHTMLアンカーパターン
-        patterns = [
-            r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*([^<\n]+)',
-            r'(\d{1,2}:\d{2}(?::\d{2})?)(?:</a>)?\s*([^<\n\r]+?)(?=\s*<|$)',
-            r'<a[^>]*href="[^"]*[&?]t=\d+"[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*(.+?)(?=<|$)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        for pattern_re in _HTML_TIMESTAMP_RES:
+            matches = pattern_re.finditer(text)
             for match in matches:
                 timestamp = match.group(1)
                 content = self.text_cleaner.clean_text(match.group(2))
@@ -106,42 +160,21 @@ class EnhancedTimestampExtractor:
     def extract_plain_timestamps(self, text: str) -> List[Tuple[str, str]]:
         """プレーンテキスト形式のタイムスタンプを抽出（改善版）"""
         results = []
-        patterns = [
-            self.extraction_config['patterns']['plain_timestamp'],
-            self.extraction_config['patterns']['flexible_timestamp'],
-            self.extraction_config['patterns']['japanese_timestamp']
-        ]
-        
-        # より多くの可能なパターンを追加（曲名のみにも対応）
-        additional_patterns = [
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–—:：・･]\s*(.+?)(?=\n|$)',
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s+(.+?)(?=\n|\d{1,2}:\d{2}|$)',
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[）)]\s*(.+?)(?=\n|$)',
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*(.+?)(?=\s+\d{1,2}:\d{2}|\n|$)',
-            # 曲名のみのパターンを追加
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*(.+?)$',  # 行末まで
-            r'(\d{1,2}:\d{2}(?::\d{2})?)[\s\t]*(.+?)(?=\s*\d{1,2}:\d{2}|$)',  # より柔軟
-            r'(\d{1,2}:\d{2}(?::\d{2})?)[^\w]*(.+?)(?=\n|$)',  # 記号区切りも許可
-        ]
-        
-        all_patterns = patterns + additional_patterns
+        seen = set()
+        text_res, line_res = self._plain_timestamp_res()
         
         # テキスト全体と行ごとの両方で処理
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        for pattern_re in text_res:
+            matches = pattern_re.finditer(text)
             for match in matches:
                 timestamp = match.group(1)
                 content = self.text_cleaner.clean_text(match.group(2))
                 
                 if self.is_valid_timestamp(timestamp, content):
-                    # 重複チェック
-                    duplicate = False
-                    for existing_ts, existing_content in results:
-                        if existing_ts == timestamp and existing_content.lower() == content.lower():
-                            duplicate = True
-                            break
-                    
-                    if not duplicate:
+                    # 重複チェック（タイムスタンプと小文字化した内容の組で判定）
+                    key = (timestamp, content.lower())
+                    if key not in seen:
+                        seen.add(key)
                         results.append((timestamp, content))
         
         # 行ごとに処理（元の処理も残す）
@@ -152,21 +185,17 @@ class EnhancedTimestampExtractor:
             if not line:
                 continue
             
-            for pattern in all_patterns:
-                matches = re.finditer(pattern, line)
+            for pattern_re in line_res:
+                matches = pattern_re.finditer(line)
                 for match in matches:
                     timestamp = match.group(1)
                     content = self.text_cleaner.clean_text(match.group(2))
                     
                     if self.is_valid_timestamp(timestamp, content):
                         # 重複チェック
-                        duplicate = False
-                        for existing_ts, existing_content in results:
-                            if existing_ts == timestamp and existing_content.lower() == content.lower():
-                                duplicate = True
-                                break
-                        
-                        if not duplicate:
+                        key = (timestamp, content.lower())
+                        if key not in seen:
+                            seen.add(key)
                             results.append((timestamp, content))
         
         return results
@@ -181,34 +210,15 @@ class EnhancedTimestampExtractor:
             return False
         
         # 必要最小限の除外パターンのみ
-        critical_invalid = [
-            r'^https?://',  # URLは除外
-            r'UCY85ViSyTU5Wy_bwsUVjkdA',  # チャンネルIDは除外
-            r'youtube\.com/watch',  # YouTube URLは除外
-            r'^www\.',
-            r'href=',
-            r'</a>',
-            r'<a ',
-        ]
-        
-        for pattern in critical_invalid:
-            if re.search(pattern, content, re.IGNORECASE):
-                return False
+        if _CRITICAL_INVALID_RE.search(content):
+            return False
         
         # 明らかに楽曲でないものを除外（最小限）
-        obvious_non_music = [
-            r'^(おつ|お疲|ありがと|thank|thanks|good|nice|www|ww|w$)',
-            r'^(配信|stream|chat|コメ|comment|次|next)',
-            r'^[0-9]+$',  # 数字のみは除外
-            r'^[!@#$%^&*()_+={}[\]:";\'<>?,./~`-]+$',  # 記号のみは除外
-        ]
-        
-        for pattern in obvious_non_music:
-            if re.search(pattern, content, re.IGNORECASE):
-                return False
+        if _NON_MUSIC_RE.search(content):
+            return False
         
         # 基本的に文字が含まれていればOK（曲名のみでも許可）
-        if re.search(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', content):
+        if _TEXT_CHAR_RE.search(content):
             return True
         
         return False
@@ -233,7 +243,7 @@ class EnhancedTimestampExtractor:
         for timestamp, content in results:
             # より詳細な正規化キー
             normalized_timestamp = timestamp.lower().strip()
-            normalized_content = re.sub(r'\s+', ' ', content.lower().strip())
+            normalized_content = _WHITESPACE_RE.sub(' ', content.lower().strip())
             
             key = (normalized_timestamp, normalized_content)
             if key not in seen:
@@ -323,12 +333,12 @@ class EnhancedSongParser:
     def _clean_artist_name(self, artist: str) -> str:
         """アーティスト名をクリーニング"""
         # 括弧内の情報を除去（ただし、重要な情報は保持）
-        artist = re.sub(r'\([^)]*cover[^)]*\)', '', artist, flags=re.IGNORECASE)
-        artist = re.sub(r'\([^)]*version[^)]*\)', '', artist, flags=re.IGNORECASE)
+        artist = _ARTIST_COVER_RE.sub('', artist)
+        artist = _ARTIST_VERSION_RE.sub('', artist)
         
         # 余分な記号を除去
-        artist = re.sub(r'^[・･\-\s]+', '', artist)
-        artist = re.sub(r'[・･\-\s]+$', '', artist)
+        artist = _ARTIST_LEADING_SYMBOLS_RE.sub('', artist)
+        artist = _ARTIST_TRAILING_SYMBOLS_RE.sub('', artist)
         
         return artist.strip()
 
@@ -21,6 +21,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from utils.infoclass import VideoInfo, CommentInfo, TimeStamp
 from utils.utils import aligned_json_dump
+from utils.api_cache import load_cache, save_cache
 from extractors.enhanced_extractor import (
     Config, EnhancedTimestampExtractor,
     EnhancedGenreClassifier, EnhancedSongParser,
@@ -28,9 +29,19 @@ from extractors.enhanced_extractor import (
 )
 from analyzers.transcript_topic_analyzer import TranscriptTopicAnalyzer
 
+# APIキャッシュの有効期限（秒）。配信後に概要欄の修正やタイムスタンプコメントが付くため短めにする
+VIDEO_CACHE_TTL = 24 * 60 * 60
+COMMENT_CACHE_TTL = 24 * 60 * 60
+
 class SingleVideoExtractor:
-    def __init__(self):
-        """初期化"""
+    def __init__(self, use_cache: bool = True):
+        """初期化
+
+        Args:
+            use_cache: Falseの場合はAPIキャッシュを読まずに必ず再取得する
+        """
+        self.use_cache = use_cache
+
         # 環境設定
         load_dotenv()
         self.api_key = os.getenv('API_KEY')
@@ -114,19 +125,27 @@ class SingleVideoExtractor:
     def get_video_info(self, video_id: str) -> Optional[VideoInfo]:
         """動画情報を取得"""
         try:
-            # 動画の基本情報を取得
-            response = self.youtube.videos().list(
-                part='snippet,liveStreamingDetails',
-                id=video_id,
-                fields='items(snippet(publishedAt,title,description),liveStreamingDetails/actualStartTime)'
-            ).execute()
-            
-            items = response.get('items', [])
-            if not items:
-                print(f"動画が見つかりませんでした: {video_id}")
-                return None
+            # キャッシュがあればAPIを呼ばない
+            item = load_cache('videos', video_id, ttl=VIDEO_CACHE_TTL) if self.use_cache else None
+            if item is None:
+                # 動画の基本情報を取得
+                response = self.youtube.videos().list(
+                    part='snippet,liveStreamingDetails',
+                    id=video_id,
+                    fields='items(snippet(publishedAt,title,description),liveStreamingDetails(actualStartTime,actualEndTime))'
+                ).execute()
+                
+                items = response.get('items', [])
+                if not items:
+                    print(f"動画が見つかりませんでした: {video_id}")
+                    return None
+                
+                item = items[0]
+                # 終了済みの配信だけ保存する（開始前・配信中・通常動画は開始時刻や概要欄が変わりうる）
+                live_details = item.get('liveStreamingDetails', {})
+                if live_details.get('actualStartTime') and live_details.get('actualEndTime'):
+                    save_cache('videos', video_id, item)
             
-            item = items[0]
             snippet = item['snippet']
             
             # VideoInfoオブジェクトを作成
@@ -164,6 +183,13 @@ class SingleVideoExtractor:
         top_comment_f = f"items/snippet/topLevelComment/{comment_field}"
         replies_f = f"items/replies/comments/{comment_field}"
         
+        # ページング済みのコメント一覧がキャッシュにあれば再取得しない
+        cache_key = f"{video_id}_{max_results}"
+        cached = load_cache('comments', cache_key, ttl=COMMENT_CACHE_TTL) if self.use_cache else None
+        if cached is not None:
+            print(f"{len(cached)}件のコメントをキャッシュから読み込みました")
+            return [CommentInfo.from_json(c) for c in cached]
+        
         try:
             print(f"コメントを取得中... (最大{max_results}件)")
             request = self.youtube.commentThreads().list(
@@ -190,6 +216,7 @@ class SingleVideoExtractor:
                 request = self.youtube.commentThreads().list_next(request, response)
             
             print(f"{len(comment_list)}件のコメントを取得しました")
+            save_cache('comments', cache_key, [asdict(c) for c in comment_list])
             
         except HttpError as e:
             if e.resp.status == 403:
@@ -247,13 +274,7 @@ class SingleVideoExtractor:
     
     def _timestamp_to_seconds(self, timestamp: str) -> int:
         """タイムスタンプ文字列を秒数に変換"""
-        parts = timestamp.split(':')
-        if len(parts) == 2:  # MM:SS
-            return int(parts[0]) * 60 + int(parts[1])
-        elif len(parts) == 3:  # HH:MM:SS
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        else:
-            return 0
+        return TimeStamp.to_seconds(timestamp)
     
     def calculate_confidence_score(self, video_info: VideoInfo) -> float:
         """歌動画の確度スコアを計算"""
@@ -461,7 +482,8 @@ class SingleVideoExtractor:
 def main():
     """メイン関数（テスト用）"""
     try:
-        extractor = SingleVideoExtractor()
+        # --no-cache 指定時はAPIキャッシュを使わずに取得し直す
+        extractor = SingleVideoExtractor(use_cache='--no-cache' not in sys.argv[1:])
         
         # テスト用の動画ID
         video_id = input("動画ID または YouTube URL を入力してください: ").strip()
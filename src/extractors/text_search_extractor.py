@@ -6,32 +6,60 @@ YouTubeチャンネルから特定文字列を検索するスクリプト
 
 import json
 import os
+import sys
 import csv
+import heapq
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
-from googleapiclient import discovery
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi
-    TRANSCRIPT_AVAILABLE = True
-except ImportError:
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.youtube_client import ThreadLocalClient
+
+# 重いモジュールは有無だけを確認し、実際の import は使用時まで遅らせる
+TRANSCRIPT_AVAILABLE = find_spec('youtube_transcript_api') is not None
+if not TRANSCRIPT_AVAILABLE:
     print("[!] youtube-transcript-api が見つかりません。字幕検索には必要です。")
     print("    インストール: pip install youtube-transcript-api")
-    TRANSCRIPT_AVAILABLE = False
 
-try:
-    from chat_downloader import ChatDownloader
-    CHAT_DOWNLOADER_AVAILABLE = True
-except ImportError:
+CHAT_DOWNLOADER_AVAILABLE = find_spec('chat_downloader') is not None
+if not CHAT_DOWNLOADER_AVAILABLE:
     print("[!] chat-downloader が見つかりません。ライブチャット検索には必要です。")
     print("    インストール: pip install chat-downloader")
-    CHAT_DOWNLOADER_AVAILABLE = False
+
+
+@lru_cache(maxsize=None)
+def _discovery():
+    """googleapiclient.discovery を初回使用時に読み込む"""
+    from googleapiclient import discovery
+    return discovery
+
+
+@lru_cache(maxsize=None)
+def _transcript_api():
+    """YouTubeTranscriptApi クラスを初回使用時に読み込む"""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    return YouTubeTranscriptApi
+
+
+@lru_cache(maxsize=None)
+def _chat_downloader():
+    """ChatDownloader クラスを初回使用時に読み込む"""
+    from chat_downloader import ChatDownloader
+    return ChatDownloader
+
+
+# コメント取得を並列に行う動画数
+COMMENT_FETCH_WORKERS = 8
 
 
 @dataclass
@@ -57,9 +85,14 @@ class TextSearchExtractor:
         if not self.api_key:
             raise RuntimeError(".envファイルにAPI_KEYが設定されていません")
 
-        self.youtube = discovery.build('youtube', 'v3', developerKey=self.api_key)
+        self.youtube = _discovery().build('youtube', 'v3', developerKey=self.api_key)
         self.results: List[SearchResult] = []
 
+        # 並列取得ではワーカースレッドごとにクライアントを持たせる
+        self._youtube_clients = ThreadLocalClient(
+            self.youtube, lambda: _discovery().build('youtube', 'v3', developerKey=self.api_key)
+        )
+
     def get_channel_videos(self, channel_id: str, max_videos: int = 50) -> List[Dict]:
         """チャンネルの動画一覧を取得"""
         print(f"\n[*] チャンネルの動画を取得中: {channel_id}")
@@ -119,9 +152,10 @@ class TextSearchExtractor:
         """コメント内を検索"""
         results = []
         search_lower = search_text.lower()
+        youtube = self._youtube_clients.get()
 
         try:
-            request = self.youtube.commentThreads().list(
+            request = youtube.commentThreads().list(
                 part="snippet",
                 videoId=video_id,
                 maxResults=min(max_comments, 100),
@@ -152,7 +186,7 @@ class TextSearchExtractor:
                                      (f"&t={self._timestamp_to_seconds(timestamp)}" if timestamp else "")
                         ))
 
-                request = self.youtube.commentThreads().list_next(request, response)
+                request = youtube.commentThreads().list_next(request, response)
                 time.sleep(0.3)
 
         except HttpError as e:
@@ -176,7 +210,7 @@ class TextSearchExtractor:
 
         try:
             # 字幕を取得
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript_list = _transcript_api().list_transcripts(video_id)
 
             # 日本語優先で取得
             transcript = None
@@ -227,7 +261,7 @@ class TextSearchExtractor:
         try:
             # ChatDownloaderを使用してチャットを取得
             url = f"https://www.youtube.com/watch?v={video_id}"
-            chat = ChatDownloader().get_chat(url)
+            chat = _chat_downloader()().get_chat(url)
 
             # チャットメッセージを検索
             for message in chat:
@@ -290,6 +324,21 @@ class TextSearchExtractor:
 
         all_results = []
 
+        # コメントのページングは動画ごとに逐次だが、動画同士は独立しているので
+        # 全動画分をスレッドプールで先に並列取得しておく
+        comment_results_map: Dict[str, List[SearchResult]] = {}
+        if search_comments:
+            print("[*] コメントを並列取得中...")
+            with ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS) as executor:
+                comment_results_list = executor.map(
+                    lambda v: self.search_in_comments(
+                        v['video_id'], v['title'], v['published_at'], search_text
+                    ),
+                    videos
+                )
+                for video, comment_results in zip(videos, comment_results_list):
+                    comment_results_map[video['video_id']] = comment_results
+
         # 各動画を検索
         for i, video in enumerate(videos, 1):
             video_id = video['video_id']
@@ -304,12 +353,9 @@ class TextSearchExtractor:
 
             print(f"\r[{i}/{len(videos)}] {safe_title}...", end='', flush=True)
 
-            # コメント検索
+            # コメント検索（並列取得済みの結果を動画順に追加）
             if search_comments:
-                comment_results = self.search_in_comments(
-                    video_id, video_title, published_at, search_text
-                )
-                all_results.extend(comment_results)
+                all_results.extend(comment_results_map.get(video_id, []))
 
             # 字幕検索
             if search_transcripts:
@@ -415,16 +461,18 @@ class TextSearchExtractor:
             source_jp = source_map.get(source, source)
             print(f"   {source_jp}: {count}件")
 
-        # 動画別
+        # 動画別（タイトルは最初に出現した結果のものを使う）
         video_counts = {}
+        video_titles = {}
         for result in results:
             video_counts[result.video_id] = video_counts.get(result.video_id, 0) + 1
+            video_titles.setdefault(result.video_id, result.video_title)
 
         print(f"\n動画別ヒット数 (上位5件):")
-        sorted_videos = sorted(video_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        for video_id, count in sorted_videos:
-            # タイトルを取得
-            title = next((r.video_title for r in results if r.video_id == video_id), video_id)
+        # 全動画をソートせず上位5件だけを取り出す（同数の場合は出現順）
+        top_videos = heapq.nlargest(5, video_counts.items(), key=lambda x: x[1])
+        for video_id, count in top_videos:
+            title = video_titles.get(video_id, video_id)
             print(f"   {title[:50]}... ({count}件)")
 
         print(f"{'='*70}\n")
@@ -3,17 +3,82 @@ APIキーなしで動画の字幕のみから楽曲情報を抽出するスク
 """
 import json
 import re
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator
 
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi
-    TRANSCRIPT_AVAILABLE = True
-except ImportError:
+# youtube_transcript_api は読み込みに時間がかかるため、有無だけを確認して実際の import は使用時まで遅らせる
+TRANSCRIPT_AVAILABLE = find_spec('youtube_transcript_api') is not None
+if not TRANSCRIPT_AVAILABLE:
     print("youtube-transcript-api not installed. Run: pip install youtube-transcript-api")
-    TRANSCRIPT_AVAILABLE = False
+
+
+@lru_cache(maxsize=None)
+def _transcript_api():
+    """YouTubeTranscriptApi クラスを初回使用時に読み込む"""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    return YouTubeTranscriptApi
 
 from enhanced_extractor import Config, EnhancedGenreClassifier, EnhancedSongParser, EnhancedTextCleaner
 
+# 字幕1行ごとに呼ばれる判定用の正規表現（複数パターンは1つの選択パターンにまとめて一度だけコンパイル）
+
+# 楽曲に関する言及（より包括的な楽曲関連パターン）
+# 固定文字列は正規表現を通さず部分一致で判定し、正規表現が必要なものだけを残す
+_SONG_MENTION_RE = re.compile(
+    r'[「『]([^」』]+)[」』]'  # 括弧で囲まれた楽曲名
+    r'|次.*歌|歌.*次'
+)
+_SONG_MENTION_LITERALS = (
+    '続いて', 'それでは', '今度は', 'お次は',
+    '歌います', '歌わせて', '歌った', '歌う', '歌って',
+    'リクエスト', '歌枠', 'うたわく', 'カラオケ', 'からおけ',
+    'カバー', 'オリジナル', 'ボカロ', 'アニソン',
+    '曲',  # 「楽曲」も含む
+    'ソング',
+    'プロジェクト',  # 楽曲プロジェクト名
+    'ミックス',  # 楽曲ミックス
+)
+# 英語のキーワードは大文字小文字を区別しない（小文字化したテキストで判定）
+_SONG_MENTION_ASCII_LITERALS = ('cover', 'original', 'vocaloid', 'anime', 'song', 'mix')
+
+# 短いテキストの音楽的な要素（小文字化したテキストで判定）
+_MUSIC_INDICATORS = ('歌', 'うた', '曲', 'song', 'sing', 'music')
+
+# 楽曲らしい単語（大文字小文字は区別する）
+_MUSIC_KEYWORDS = ('歌', '曲', 'ソング', 'song', 'ミックス', 'mix', 'プロジェクト', 'オリジナル')
+
+# 明らかに楽曲でないもの（最小限）
+_NOT_SONG_TITLE_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'^(はい|そう|うん|ええ|よし)$',  # 単体の相槌のみ
+    r'^(www|ww|w)$',  # 笑いの表現のみ
+    r'^[0-9]+$',  # 数字のみ
+    r'^[!@#$%^&*()_+={}[\]:";\'<>?,./~`\s-]+$',  # 記号のみ
+    r'^[\s\u3000]+$',  # 空白のみ
+]), re.IGNORECASE)
+
+# "次は〜"のような形式（より柔軟に）
+_NEXT_SONG_PATTERNS = [re.compile(p) for p in [
+    r'次.*[はに：は、](.+)',
+    r'続いて.*[はに：は、](.+)',
+    r'歌います.*[はに：は、](.+)',
+    r'歌わせて.*[はに：は、](.+)',
+    r'歌った.*[はに：は、](.+)',
+    r'歌う.*[はに：は、](.+)',
+    r'プロジェクト.*[はに：は、](.+)',
+    r'リクエスト.*[はに：は、](.+)',
+    r'オリジナル.*[はに：は、](.+)',
+]]
+
+_BRACKET_TITLE_RE = re.compile(r'[「『]([^」』]+)[」』]')
+_TRAILING_PUNCT_RE = re.compile(r'[。、！？\.\!\?]+$')
+_LEADING_AIZUCHI_RE = re.compile(r'^[はい、そうね。]+')
+_TITLE_CHAR_RE = re.compile(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+_INTRO_KEYWORD_RE = re.compile(r'次.*歌|歌.*次|続いて|歌います')
+
+# 秒の2桁表記（"00"〜"59"）。タイムスタンプ整形のたびに書式指定しないよう事前に作っておく
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(60))
+
 class TranscriptOnlyScraper:
     def __init__(self, config: Config):
         self.config = config
@@ -44,7 +109,7 @@ class TranscriptOnlyScraper:
         try:
             # v1.2.2のAPI使用方法
             # 字幕リストを取得
-            ytt_api = YouTubeTranscriptApi()
+            ytt_api = _transcript_api()()
             transcript_list = ytt_api.list(video_id)
             
             # 利用可能な字幕から日本語を優先して選択
@@ -80,80 +145,69 @@ class TranscriptOnlyScraper:
             print(f"Error getting transcript for {video_id}: {e}")
             return []
     
-    def extract_songs_from_transcript(self, transcript_data: List[Dict], video_id: str) -> List[Dict[str, Any]]:
-        """字幕データから楽曲情報を抽出"""
-        songs = []
-        
-        print(f"Analyzing {len(transcript_data)} transcript entries...")
-        
-        for i, entry in enumerate(transcript_data):
+    def _iter_entries(self, transcript_data: Iterable[Any]) -> Iterator[Tuple[str, float]]:
+        """字幕エントリを (テキスト, 開始秒) として1件ずつ返す"""
+        for entry in transcript_data:
             text = entry.text.strip() if hasattr(entry, 'text') else str(entry).strip()
             start_time = entry.start if hasattr(entry, 'start') else 0
-            
-            # タイムスタンプを作成
-            timestamp = self._seconds_to_timestamp(start_time)
-            
-            # 楽曲情報の可能性をチェック
-            if self._is_song_mention(text):
-                song_info = self._extract_song_info(text)
-                if song_info:
-                    song_title, artist = self.song_parser.parse_song_info(song_info)
-                    genre = self.genre_classifier.classify_genre(song_title, artist)
-                    
-                    songs.append({
-                        'timestamp': timestamp,
-                        'title': song_title,
-                        'artist': artist,
-                        'search_term': f"{song_title} {artist}".strip(),
-                        'genre': genre,
-                        'video_id': video_id,
-                        'confidence': self._calculate_confidence(text),
-                        'original_text': text
-                    })
-        
-        # 重複除去
-        unique_songs = []
+            yield text, start_time
+    
+    def extract_songs_from_transcript(self, transcript_data: Iterable[Any], video_id: str) -> List[Dict[str, Any]]:
+        """字幕データから楽曲情報を抽出
+
+        字幕データはリストでなくてもよく、エントリを1件ずつ処理するため
+        楽曲の言及を含まないエントリは中間データを作らずに読み捨てる。
+        """
+        songs = []
+        # 重複除去用（曲名・アーティストの組）
         seen = set()
         
-        for song in songs:
-            key = f"{song['title'].lower()}_{song['artist'].lower()}"
-            if key not in seen:
+        print("Analyzing transcript entries...")
+        
+        # 楽曲情報の可能性があるエントリだけを残す
+        mentions = ((text, start_time) for text, start_time in self._iter_entries(transcript_data)
+                    if self._is_song_mention(text))
+        
+        for text, start_time in mentions:
+            song_info = self._extract_song_info(text)
+            if song_info:
+                song_title, artist = self.song_parser.parse_song_info(song_info)
+                
+                # 既出の曲はジャンル判定などを行う前に除外
+                key = (song_title.casefold(), artist.casefold())
+                if key in seen:
+                    continue
                 seen.add(key)
-                unique_songs.append(song)
+                
+                # タイムスタンプを作成（採用する曲だけ）
+                timestamp = self._seconds_to_timestamp(start_time)
+                
+                genre = self.genre_classifier.classify_genre(song_title, artist)
+                
+                songs.append({
+                    'timestamp': timestamp,
+                    'title': song_title,
+                    'artist': artist,
+                    'search_term': f"{song_title} {artist}".strip(),
+                    'genre': genre,
+                    'video_id': video_id,
+                    'confidence': self._calculate_confidence(text),
+                    'original_text': text
+                })
         
-        return unique_songs
+        return songs
     
     def _is_song_mention(self, text: str) -> bool:
         """テキストが楽曲に関する言及かどうかを判定（改良版）"""
-        # より包括的な楽曲関連パターン
-        song_patterns = [
-            r'[「『]([^」』]+)[」』]',  # 括弧で囲まれた楽曲名
-            r'次.*歌|歌.*次',
-            r'続いて',
-            r'それでは',
-            r'今度は',
-            r'お次は',
-            r'歌います',
-            r'歌わせて',
-            r'歌った',
-            r'歌う',
-            r'歌って',
-            r'リクエスト',
-            r'歌枠|うたわく',
-            r'カラオケ|からおけ',
-            r'cover|カバー',
-            r'original|オリジナル',
-            r'ボカロ|vocaloid',
-            r'アニソン|anime',
-            r'楽曲|曲',
-            r'ソング|song',
-            r'プロジェクト',  # 楽曲プロジェクト名
-            r'ミックス|mix',  # 楽曲ミックス
-        ]
+        if any(literal in text for literal in _SONG_MENTION_LITERALS):
+            return True
         
-        for pattern in song_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
+        if _SONG_MENTION_RE.search(text):
+            return True
+        
+        text_lower = text.lower()
+        if any(literal in text_lower for literal in _SONG_MENTION_ASCII_LITERALS):
+            return True
         
         # アーティスト名や楽曲らしい要素
         if any(sep in text for sep in ['/', 'feat.', 'CV.', '×', 'with']):
@@ -161,8 +215,7 @@ class TranscriptOnlyScraper:
         
         # 短いテキストで音楽的な要素がある場合
         if len(text.strip()) < 50:  # 短い文章
-            music_indicators = ['歌', 'うた', '曲', 'song', 'sing', 'music']
-            if any(indicator in text.lower() for indicator in music_indicators):
+            if any(indicator in text_lower for indicator in _MUSIC_INDICATORS):
                 return True
         
         return False
@@ -170,39 +223,26 @@ class TranscriptOnlyScraper:
     def _extract_song_info(self, text: str) -> Optional[str]:
         """テキストから楽曲情報を抽出（改良版）"""
         # 括弧で囲まれた部分を抽出
-        bracket_match = re.search(r'[「『]([^」』]+)[」』]', text)
+        bracket_match = _BRACKET_TITLE_RE.search(text)
         if bracket_match:
             return bracket_match.group(1)
         
         # "次は〜"のような形式（より柔軟に）
-        next_patterns = [
-            r'次.*[はに：は、](.+)',
-            r'続いて.*[はに：は、](.+)',
-            r'歌います.*[はに：は、](.+)',
-            r'歌わせて.*[はに：は、](.+)',
-            r'歌った.*[はに：は、](.+)',
-            r'歌う.*[はに：は、](.+)',
-            r'プロジェクト.*[はに：は、](.+)',
-            r'リクエスト.*[はに：は、](.+)',
-            r'オリジナル.*[はに：は、](.+)',
-        ]
-        
-        for pattern in next_patterns:
-            match = re.search(pattern, text)
+        for pattern in _NEXT_SONG_PATTERNS:
+            match = pattern.search(text)
             if match:
                 extracted = match.group(1).strip()
                 # 不要な部分を除去
-                extracted = re.sub(r'[。、！？\.\!\?]+$', '', extracted)
+                extracted = _TRAILING_PUNCT_RE.sub('', extracted)
                 if len(extracted) > 1:
                     return extracted
         
         # 楽曲らしい単語が含まれている短いテキスト
         if len(text.strip()) < 100:  # 短めのテキスト
-            music_keywords = ['歌', '曲', 'ソング', 'song', 'ミックス', 'mix', 'プロジェクト', 'オリジナル']
-            if any(keyword in text for keyword in music_keywords):
+            if any(keyword in text for keyword in _MUSIC_KEYWORDS):
                 # 楽曲名らしい部分を抽出
-                cleaned_text = re.sub(r'^[はい、そうね。]+', '', text)  # 相槌を除去
-                cleaned_text = re.sub(r'[。、！？\.\!\?]+$', '', cleaned_text)  # 句読点を除去
+                cleaned_text = _LEADING_AIZUCHI_RE.sub('', text)  # 相槌を除去
+                cleaned_text = _TRAILING_PUNCT_RE.sub('', cleaned_text)  # 句読点を除去
                 if len(cleaned_text.strip()) > 2:
                     return cleaned_text.strip()
         
@@ -215,17 +255,8 @@ class TranscriptOnlyScraper:
     def _looks_like_song_title(self, text: str) -> bool:
         """テキストが楽曲タイトルらしいかどうかを判定（緩和版）"""
         # 明らかに楽曲でないもの（最小限）
-        exclude_patterns = [
-            r'^(はい|そう|うん|ええ|よし)$',  # 単体の相槌のみ
-            r'^(www|ww|w)$',  # 笑いの表現のみ
-            r'^[0-9]+$',  # 数字のみ
-            r'^[!@#$%^&*()_+={}[\]:";\'<>?,./~`\s-]+$',  # 記号のみ
-            r'^[\s\u3000]+$',  # 空白のみ
-        ]
-        
-        for pattern in exclude_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False
+        if _NOT_SONG_TITLE_RE.search(text):
+            return False
         
         # 長さ制限を緩和（短すぎるか長すぎる場合のみ除外）
         text_len = len(text.strip())
@@ -233,7 +264,7 @@ class TranscriptOnlyScraper:
             return False
         
         # 基本的に文字が含まれていればOK
-        if re.search(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', text):
+        if _TITLE_CHAR_RE.search(text):
             return True
         
         return False
@@ -243,11 +274,11 @@ class TranscriptOnlyScraper:
         confidence = 0.5  # ベース値
         
         # 括弧で囲まれている場合は高信頼度
-        if re.search(r'[「『][^」』]+[」』]', text):
+        if _BRACKET_TITLE_RE.search(text):
             confidence += 0.3
         
         # 楽曲紹介のキーワードがある場合
-        if re.search(r'次.*歌|歌.*次|続いて|歌います', text):
+        if _INTRO_KEYWORD_RE.search(text):
             confidence += 0.2
         
         # アーティスト情報がある場合
@@ -258,9 +289,8 @@ class TranscriptOnlyScraper:
     
     def _seconds_to_timestamp(self, seconds: float) -> str:
         """秒数をタイムスタンプ形式（MM:SS）に変換"""
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes}:{secs:02d}"
+        minutes, secs = divmod(int(seconds), 60)
+        return f"{minutes}:{_TWO_DIGITS[secs]}"
     
     def scrape_single_video(self, video_url: str) -> List[Dict[str, Any]]:
         """単一の動画から楽曲情報を抽出"""
@@ -323,20 +353,15 @@ def main():
             
             with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
                 fieldnames = ['No', '曲', '歌手-ユニット', '検索用', 'ジャンル', 'タイムスタンプ', '動画ID', '信頼度']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for i, song in enumerate(songs, 1):
-                    writer.writerow({
-                        'No': i,
-                        '曲': song['title'],
-                        '歌手-ユニット': song['artist'],
-                        '検索用': song['search_term'],
-                        'ジャンル': song['genre'],
-                        'タイムスタンプ': song['timestamp'],
-                        '動画ID': song['video_id'],
-                        '信頼度': song['confidence']
-                    })
+                # 行ごとに辞書を作らず、列順のタプルをまとめて書き出す
+                writer.writerow(fieldnames)
+                writer.writerows(
+                    (i, song['title'], song['artist'], song['search_term'], song['genre'],
+                     song['timestamp'], song['video_id'], song['confidence'])
+                    for i, song in enumerate(songs, 1)
+                )
             
             print(f"Saved to {output_file}")
     else:
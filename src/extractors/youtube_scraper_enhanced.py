@@ -3,25 +3,20 @@ import os
 import re
 import csv
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from dataclasses import asdict
+from functools import lru_cache
 from typing import List, Optional
 
 from googleapiclient import discovery
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
-# MeCabのインポート（オプション）
-try:
-    import MeCab
-    mecab_reading = MeCab.Tagger('-Oyomi')
-    print("MeCab loaded successfully")
-except (ImportError, RuntimeError) as e:
-    print(f"MeCab not available: {type(e).__name__}. Using simple hiragana conversion.")
-    mecab_reading = None
-
 from src.utils.infoclass import VideoInfo, CommentInfo, TimeStamp
 from src.utils.utils import aligned_json_dump
+from src.utils.api_cache import load_cache, save_cache
+from src.utils.youtube_client import ThreadLocalClient
+from src.utils.text_utils import SIMPLE_HIRAGANA_TABLE, has_min_timestamps, to_hiragana
 from src.extractors.enhanced_extractor import (
     Config, EnhancedTimestampExtractor,
     EnhancedGenreClassifier, EnhancedSongParser,
@@ -36,6 +31,19 @@ if not API_KEY:
 
 youtube = discovery.build('youtube', 'v3', developerKey=API_KEY)
 
+# API呼び出しを並列化するスレッド数
+API_WORKERS = 16
+
+# videos().list に一度に渡せる動画IDの上限
+VIDEOS_PER_REQUEST = 50
+
+# APIキャッシュの有効期限（秒）。新着動画・新着コメントを拾えるよう一覧系は短めにする
+PLAYLIST_CACHE_TTL = 6 * 60 * 60
+COMMENT_CACHE_TTL = 24 * 60 * 60
+
+# 並列取得ではワーカースレッドごとにクライアントを持つ
+_youtube_clients = ThreadLocalClient(youtube, lambda: discovery.build('youtube', 'v3', developerKey=API_KEY))
+
 # 設定ファイル読み込み
 try:
     config = Config('config.json')
@@ -72,6 +80,64 @@ except FileNotFoundError:
     with open('user_ids.json', 'w', encoding='utf-8') as f:
         json.dump(users, f, ensure_ascii=False, indent=2)
 
+JST = timezone(timedelta(hours=9))
+
+# 判定用の正規表現（動画ごとに再コンパイル・キャッシュ参照しないよう事前に用意）
+_LEADING_NUM_RE = re.compile(r"^\s*\d+")
+
+
+def compile_bonus_patterns(singing_config: dict) -> list:
+    """ボーナスパターンを (コンパイル済み正規表現, 加点) のリストに変換"""
+    return [
+        (re.compile(pattern), 3 if pattern == '[歌うたウタ]' else 2)
+        for pattern in singing_config.get('bonus_patterns', [])
+    ]
+
+
+def lower_keywords(singing_config: dict, name: str) -> tuple:
+    """キーワードリストを小文字化したタプルに変換"""
+    return tuple(k.lower() for k in singing_config.get(name, []))
+
+
+# 設定を読み直した場合は compile_bonus_patterns() / lower_keywords() で作り直すこと
+_COMPILED_BONUS = compile_bonus_patterns(config.singing_detection)
+_INCLUDE_KEYWORDS = lower_keywords(config.singing_detection, 'include_keywords')
+_EXCLUDE_KEYWORDS = lower_keywords(config.singing_detection, 'exclude_keywords')
+# タイトルに含まれていれば他のスコアに関係なく歌枠ではないとみなすキーワード（例: "ゲーム実況"）
+_HARD_EXCLUDE_KEYWORDS = lower_keywords(config.singing_detection, 'hard_exclude')
+
+
+def is_hard_excluded(title: str) -> bool:
+    """タイトルが確実に歌枠ではないキーワードを含むか"""
+    if not _HARD_EXCLUDE_KEYWORDS:
+        return False
+    lowered = title.lower()
+    return any(keyword in lowered for keyword in _HARD_EXCLUDE_KEYWORDS)
+
+# 同じ曲名は複数のタイムスタンプに現れるため、曲名解析は曲名単位でキャッシュする
+@lru_cache(maxsize=8192)
+def _parse_song_info_cached(title: str) -> tuple[str, str]:
+    return song_parser.parse_song_info(title)
+
+# 歌枠判定と確度スコアで同じ動画を2回採点するため、結果を動画（タイトル・概要欄）単位でキャッシュする
+@lru_cache(maxsize=8192)
+def singing_scores(title: str, description: str) -> tuple[int, int]:
+    """歌枠スコアと除外スコアを計算（判定と確度スコアで共通）"""
+    combined_text = f"{title} {description}".lower()
+    
+    singing_score = sum(1 for keyword in _INCLUDE_KEYWORDS if keyword in combined_text)
+    exclude_score = sum(1 for keyword in _EXCLUDE_KEYWORDS if keyword in combined_text)
+    
+    # ボーナスパターンをチェック
+    for pattern_re, bonus in _COMPILED_BONUS:
+        if pattern_re.search(combined_text):
+            singing_score += bonus
+    
+    if has_min_timestamps(description, 3):
+        singing_score += 2
+    
+    return singing_score, exclude_score
+
 class EnhancedAnalyzer:
     def __init__(self, config: Config):
         self.config = config
@@ -79,47 +145,11 @@ class EnhancedAnalyzer:
 
     def to_hiragana(self, text: str) -> str:
         """テキストをひらがなに変換"""
-        if mecab_reading:
-            try:
-                reading = mecab_reading.parse(text).strip()
-                hiragana = ''
-                for char in reading:
-                    if 'ァ' <= char <= 'ヶ':
-                        hiragana += chr(ord(char) - ord('ァ') + ord('ぁ'))
-                    elif char == 'ヵ':
-                        hiragana += 'か'
-                    elif char == 'ヶ':
-                        hiragana += 'け'
-                    else:
-                        hiragana += char.lower()
-                return hiragana
-            except:
-                pass
-        
-        # MeCabが使えない場合の簡易変換
-        return self._simple_katakana_to_hiragana(text.lower())
+        return to_hiragana(text)
     
     def _simple_katakana_to_hiragana(self, text: str) -> str:
         """簡易カタカナ→ひらがな変換（英数字・記号も処理）"""
-        result = ''
-        for char in text:
-            if 'ァ' <= char <= 'ヶ':
-                result += chr(ord(char) - ord('ァ') + ord('ぁ'))
-            elif char == 'ヵ':
-                result += 'か'
-            elif char == 'ヶ':
-                result += 'け'
-            elif 'A' <= char <= 'Z':
-                result += char.lower()
-            elif char in '０１２３４５６７８９':
-                # 全角数字を半角に
-                result += str(ord(char) - ord('０'))
-            elif char in '（）［］｛｝':
-                # 全角括弧を除去
-                continue
-            else:
-                result += char
-        return result
+        return text.translate(SIMPLE_HIRAGANA_TABLE)
 
     def detect_genre(self, title: str, artist: str) -> str:
         """ジャンルを自動判定（設定ファイルベース）"""
@@ -127,32 +157,10 @@ class EnhancedAnalyzer:
 
     def calculate_confidence_score(self, video_info: VideoInfo) -> float:
         """歌動画の確度スコアを計算（設定ファイルベース）"""
-        title = video_info.title
-        description = video_info.description
-        combined_text = f"{title} {description}".lower()
-        
-        include_keywords = self.singing_config.get('include_keywords', [])
-        exclude_keywords = self.singing_config.get('exclude_keywords', [])
-        bonus_patterns = self.singing_config.get('bonus_patterns', [])
-        
-        singing_score = 0
-        for keyword in include_keywords:
-            if keyword.lower() in combined_text:
-                singing_score += 1
+        if is_hard_excluded(video_info.title):
+            return 0.0
         
-        exclude_score = 0
-        for keyword in exclude_keywords:
-            if keyword.lower() in combined_text:
-                exclude_score += 1
-        
-        # ボーナスパターンをチェック
-        for pattern in bonus_patterns:
-            if re.search(pattern, combined_text):
-                singing_score += 3 if pattern == '[歌うたウタ]' else 2
-        
-        timestamp_count = len(re.findall(r'\d{1,2}:\d{2}', description))
-        if timestamp_count >= 3:
-            singing_score += 2
+        singing_score, exclude_score = singing_scores(video_info.title, video_info.description)
         
         # 正規化してスコアを0-1の範囲に
         raw_score = max(0, singing_score - exclude_score)
@@ -164,36 +172,18 @@ class EnhancedAnalyzer:
 
     def parse_song_title_artist(self, title: str) -> tuple[str, str]:
         """曲名とアーティストを分離（拡張版）"""
-        return song_parser.parse_song_info(title)
+        return _parse_song_info_cached(title)
 
 def is_singing_stream(title: str, description: str) -> bool:
     """歌動画判定ロジック（設定ファイルベース）"""
-    combined_text = f"{title} {description}".lower()
+    # 確実に歌枠でないタイトルは概要欄を見る前に除外
+    if is_hard_excluded(title):
+        return False
     
-    include_keywords = config.singing_detection.get('include_keywords', [])
-    exclude_keywords = config.singing_detection.get('exclude_keywords', [])
-    bonus_patterns = config.singing_detection.get('bonus_patterns', [])
     min_score = config.singing_detection.get('minimum_score', 2)
     min_score_override = config.singing_detection.get('minimum_score_override', 4)
     
-    singing_score = 0
-    for keyword in include_keywords:
-        if keyword.lower() in combined_text:
-            singing_score += 1
-    
-    exclude_score = 0
-    for keyword in exclude_keywords:
-        if keyword.lower() in combined_text:
-            exclude_score += 1
-    
-    # ボーナスパターンをチェック
-    for pattern in bonus_patterns:
-        if re.search(pattern, combined_text):
-            singing_score += 3 if pattern == '[歌うたウタ]' else 2
-    
-    timestamp_count = len(re.findall(r'\d{1,2}:\d{2}', description))
-    if timestamp_count >= 3:
-        singing_score += 2
+    singing_score, exclude_score = singing_scores(title, description)
     
     if singing_score >= min_score and exclude_score <= singing_score:
         return True
@@ -207,6 +197,11 @@ def get_uploads_playlist_id(channel_id: str, retry_count: int = 3) -> str | None
     if not channel_id or not channel_id.startswith("UC"):
         return None
     
+    cached = load_cache('uploads', channel_id)
+    if cached is not None:
+        return cached
+    
+    youtube = _youtube_clients.get()
     for attempt in range(retry_count):
         try:
             resp = youtube.channels().list(
@@ -217,7 +212,9 @@ def get_uploads_playlist_id(channel_id: str, retry_count: int = 3) -> str | None
             items = resp.get("items", [])
             if not items:
                 return None
-            return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+            uploads_id = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+            save_cache('uploads', channel_id, uploads_id)
+            return uploads_id
         except HttpError as e:
             if e.resp.status in [403, 429]:  # Quota exceeded or rate limited
                 if attempt < retry_count - 1:
@@ -238,42 +235,61 @@ def get_video_info_in_playlist(playlist_id: str, max_results: int = None) -> lis
     if max_results is None:
         max_results = config.data.get('api', {}).get('max_results_per_request', 50)
     
-    try:
-        request = youtube.playlistItems().list(
-            part="snippet",
-            playlistId=playlist_id,
-            maxResults=max_results,
-            fields="nextPageToken,items/snippet(publishedAt,title,description,resourceId/videoId)"
-        )
-        while request:
-            response = request.execute()
-            items = response.get("items", [])
-            for i in items:
-                vi = VideoInfo.from_response_snippet(i["snippet"])
-                vid = vi.id
-
-                # --- 動画詳細を追加で取得 ---
-                try:
-                    details = youtube.videos().list(
-                        part="liveStreamingDetails,snippet",
-                        id=vid,
-                        fields="items(snippet/publishedAt,liveStreamingDetails/actualStartTime)"
-                    ).execute()
+    youtube = _youtube_clients.get()
+    snippets = load_cache('playlist_items', playlist_id, ttl=PLAYLIST_CACHE_TTL)
+    if snippets is None:
+        snippets = []
+        try:
+            request = youtube.playlistItems().list(
+                part="snippet",
+                playlistId=playlist_id,
+                maxResults=max_results,
+                fields="nextPageToken,items/snippet(publishedAt,title,description,resourceId/videoId)"
+            )
+            while request:
+                response = request.execute()
+                snippets.extend(i["snippet"] for i in response.get("items", []))
+                request = youtube.playlistItems().list_next(request, response)
+            # 途中で失敗した一覧はキャッシュしない
+            save_cache('playlist_items', playlist_id, snippets)
+        except Exception as e:
+            print(f"プレイリスト {playlist_id} の取得でエラー: {e}")
+    video_info_list = [VideoInfo.from_response_snippet(snippet) for snippet in snippets]
 
-                    if details.get("items"):
-                        item = details["items"][0]
-                        vi.stream_start = item.get("liveStreamingDetails", {}).get("actualStartTime")
-                        if not vi.stream_start:
-                            vi.stream_start = item["snippet"]["publishedAt"]
+    # 配信開始時刻がキャッシュ済みの動画は詳細取得を省く
+    uncached: list[VideoInfo] = []
+    for vi in video_info_list:
+        stream_start = load_cache('stream_start', vi.id)
+        if stream_start is None:
+            uncached.append(vi)
+        else:
+            vi.stream_start = stream_start
 
-                except Exception as e:
-                    print(f"動画 {vid} の詳細取得でエラー: {e}")
+    # --- 動画詳細を50件ずつまとめて取得 ---
+    for start in range(0, len(uncached), VIDEOS_PER_REQUEST):
+        batch = uncached[start:start + VIDEOS_PER_REQUEST]
+        try:
+            details = youtube.videos().list(
+                part="liveStreamingDetails,snippet",
+                id=",".join(vi.id for vi in batch),
+                fields="items(id,snippet/publishedAt,liveStreamingDetails(actualStartTime,scheduledStartTime))"
+            ).execute()
+        except Exception as e:
+            print(f"動画 {batch[0].id} ほか{len(batch)}件の詳細取得でエラー: {e}")
+            continue
 
-                video_info_list.append(vi)
+        items_by_id = {item["id"]: item for item in details.get("items", [])}
+        for vi in batch:
+            item = items_by_id.get(vi.id)
+            if item:
+                vi.stream_start = item.get("liveStreamingDetails", {}).get("actualStartTime")
+                if not vi.stream_start:
+                    vi.stream_start = item["snippet"]["publishedAt"]
+                # 開始前の配信は開始時刻が確定していないのでキャッシュしない
+                live_details = item.get("liveStreamingDetails")
+                if not live_details or live_details.get("actualStartTime"):
+                    save_cache('stream_start', vi.id, vi.stream_start)
 
-            request = youtube.playlistItems().list_next(request, response)
-    except Exception as e:
-        print(f"プレイリスト {playlist_id} の取得でエラー: {e}")
     return video_info_list
 
 def get_comments(video_id: str, max_results: int = None) -> list[CommentInfo]:
@@ -282,10 +298,16 @@ def get_comments(video_id: str, max_results: int = None) -> list[CommentInfo]:
     if max_results is None:
         max_results = config.data.get('api', {}).get('max_comments_per_video', 100)
     
+    cache_key = f"{video_id}_{max_results}"
+    cached = load_cache('comment_threads', cache_key, ttl=COMMENT_CACHE_TTL)
+    if cached is not None:
+        return [CommentInfo.from_json(c) for c in cached]
+    
     comment_field = "snippet(videoId,textDisplay,textOriginal)"
     top_comment_f = f"items/snippet/topLevelComment/{comment_field}"
     replies_f = f"items/replies/comments/{comment_field}"
 
+    youtube = _youtube_clients.get()
     try:
         request = youtube.commentThreads().list(
             part="snippet,replies",
@@ -298,11 +320,16 @@ def get_comments(video_id: str, max_results: int = None) -> list[CommentInfo]:
             for item in response.get("items", []):
                 comment_list.extend(CommentInfo.response_item_to_comments(item))
             request = youtube.commentThreads().list_next(request, response)
+        save_cache('comment_threads', cache_key, [dict(vars(c)) for c in comment_list])
     except Exception as e:
         print(f"動画 {video_id} のコメント取得でエラー: {e}")
 
     return comment_list
 
+def _video_to_dict(vi: VideoInfo) -> dict:
+    """VideoInfoをJSON用のdictに変換（フィールドは平坦なのでasdictの再帰コピーは不要）"""
+    return {**vars(vi), 'comments': [vars(c) for c in vi.comments]}
+
 def main():
     print("YouTube歌動画タイムスタンプ抽出ツール（強化版）")
     print("=" * 60)
@@ -312,18 +339,18 @@ def main():
     # 1. 動画情報取得
     print("動画情報を取得中...")
     uploads_ids: list[str] = []
-    for i, uc in enumerate(users, 1):
-        print(f"  {i}/{len(users)}: チャンネル {uc}")
-        up = get_uploads_playlist_id(uc)
-        if up:
-            uploads_ids.append(up)
-        else:
-            print(f"取得失敗: {uc}")
+    with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+        for i, (uc, up) in enumerate(zip(users, executor.map(get_uploads_playlist_id, users)), 1):
+            print(f"  {i}/{len(users)}: チャンネル {uc}")
+            if up:
+                uploads_ids.append(up)
+            else:
+                print(f"取得失敗: {uc}")
 
-    video_info_list: list[VideoInfo] = []
-    for i, upid in enumerate(uploads_ids, 1):
-        print(f"  プレイリスト {i}/{len(uploads_ids)} を処理中...")
-        video_info_list += get_video_info_in_playlist(upid)
+        video_info_list: list[VideoInfo] = []
+        for i, videos in enumerate(executor.map(get_video_info_in_playlist, uploads_ids), 1):
+            print(f"  プレイリスト {i}/{len(uploads_ids)} を処理中...")
+            video_info_list += videos
 
     # 2. 歌動画フィルタリング
     print("\n歌動画を検出中...")
@@ -347,12 +374,14 @@ def main():
 
     # 3. コメント取得
     print(f"\n{len(filtered_video_list)}件の動画からコメントを取得中...")
-    for i, video_info in enumerate(filtered_video_list):
-        try:
-            print(f"  {i+1}/{len(filtered_video_list)}: {video_info.title[:50]}...")
-        except UnicodeEncodeError:
-            print(f"  {i+1}/{len(filtered_video_list)}: [特殊文字を含むタイトル]...")
-        video_info.comments = get_comments(video_info.id)
+    with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+        comment_lists = executor.map(get_comments, [vi.id for vi in filtered_video_list])
+        for i, (video_info, comments) in enumerate(zip(filtered_video_list, comment_lists)):
+            try:
+                print(f"  {i+1}/{len(filtered_video_list)}: {video_info.title[:50]}...")
+            except UnicodeEncodeError:
+                print(f"  {i+1}/{len(filtered_video_list)}: [特殊文字を含むタイトル]...")
+            video_info.comments = comments
 
     # 4. タイムスタンプ抽出（強化版）
     print("\nタイムスタンプを抽出中（強化版エンジン使用）...")
@@ -364,156 +393,154 @@ def main():
         except UnicodeEncodeError:
             print(f"  {i+1}/{len(filtered_video_list)}: [特殊文字を含むタイトル]...")
         
-        # 従来の方法も並行して使用
-        traditional_ts = TimeStamp.from_videoinfo(v)
-        
-        # 強化版エンジンでタイムスタンプを抽出
-        enhanced_timestamps = []
-        
-        # 概要欄から抽出
-        desc_timestamps = extractor.extract_all_timestamps(v.description)
-        for timestamp, content in desc_timestamps:
-            enhanced_timestamps.append({
-                'video_id': v.id,
-                'video_title': v.title,
-                'published_at': v.published_at,
-                'stream_start': getattr(v, 'stream_start', None),
-                'link': f"https://www.youtube.com/watch?v={v.id}&t={timestamp}",
-                'timestamp': timestamp,
-                'text': content
-            })
-        
-        # コメントから抽出
-        for comment in v.comments:
-            comment_timestamps = extractor.extract_all_timestamps(comment.text_display)
-            for timestamp, content in comment_timestamps:
-                enhanced_timestamps.append({
-                    'video_id': v.id,
-                    'video_title': v.title,
-                    'published_at': v.published_at,
-                    'stream_start': getattr(v, 'stream_start', None),
-                    'link': f"https://www.youtube.com/watch?v={v.id}&t={timestamp}",
-                    'timestamp': timestamp,
-                    'text': content
-                })
-        
-        # 従来の結果と強化版の結果を統合
-        all_traditional = [asdict(ts) for ts in traditional_ts]
-        
-        # 重複除去しつつマージ
+        # 重複除去用キー (動画ID, タイムスタンプ, 小文字化したテキスト)
         seen = set()
-        for ts_data in all_traditional + enhanced_timestamps:
-            key = (ts_data['video_id'], ts_data['timestamp'], ts_data['text'].lower())
+
+        # 従来の方法も並行して使用
+        for ts in TimeStamp.from_videoinfo(v):
+            key = (ts.video_id, ts.timestamp, ts.text.lower())
             if key not in seen:
                 seen.add(key)
-                # TimeStampオブジェクトに変換
-                ts_obj = TimeStamp(
-                    video_id=ts_data['video_id'],
-                    video_title=ts_data['video_title'],
-                    published_at=ts_data['published_at'],
-                    link=ts_data['link'],
-                    timestamp=ts_data['timestamp'],
-                    text=ts_data['text'],
-                    stream_start=ts_data.get('stream_start')
-                )
-                all_timestamps.append(ts_obj)
+                all_timestamps.append(ts)
+        
+        # 強化版エンジンで概要欄・コメントからタイムスタンプを抽出し、従来の結果と統合
+        stream_start = getattr(v, 'stream_start', None)
+        sources = [v.description]
+        sources.extend(comment.text_display for comment in v.comments)
+        for source in sources:
+            for timestamp, content in extractor.extract_all_timestamps(source):
+                key = (v.id, timestamp, content.lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                all_timestamps.append(TimeStamp(
+                    video_id=v.id,
+                    video_title=v.title,
+                    published_at=v.published_at,
+                    link=f"https://www.youtube.com/watch?v={v.id}&t={timestamp}",
+                    timestamp=timestamp,
+                    text=content,
+                    stream_start=stream_start
+                ))
     
     print(f"抽出されたタイムスタンプ数: {len(all_timestamps)}")
 
-    # 5. CSV形式に変換
+    # 5. CSV形式に変換しながら出力
     print("\nCSV形式に変換中...")
-    rows = []
-    seen = {}
+    output_file = "song_timestamps_enhanced.csv"
+    seen = set()
     idx = 1
+    video_by_id = {vi.id: vi for vi in filtered_video_list}
+    confidence_by_id: dict[str, tuple[str, float]] = {}
+    date_str_by_published: dict[str, str] = {}
+    high_conf = med_conf = low_conf = 0
+    genres = {}
 
-    for entry in all_timestamps:
-        video_id = entry.video_id
-        raw_title = entry.text
-        timestamp = entry.timestamp
-        published_at = getattr(entry, 'stream_start', None) or entry.published_at
+    def song_rows():
+        """CSVの行を1件ずつ生成し、統計も同時に集計する"""
+        nonlocal idx, high_conf, med_conf, low_conf
+        for entry in all_timestamps:
+            video_id = entry.video_id
+            raw_title = entry.text
+            timestamp = entry.timestamp
+            published_at = getattr(entry, 'stream_start', None) or entry.published_at
         
-        # 確度スコア計算（該当する動画を見つけて計算）
-        confidence = 0.0
-        for vi in filtered_video_list:
-            if vi.id == video_id:
-                confidence = analyzer.calculate_confidence_score(vi)
-                break
-
-        song_title, artist = analyzer.parse_song_title_artist(raw_title)
+            song_title, artist = analyzer.parse_song_title_artist(raw_title)
 
-        # 歌手なしは除外
-        if not artist:
-            continue
-
-        # 重複判定
-        key = (song_title.lower(), artist.lower(), video_id, timestamp)
-        if key in seen:
-            if re.match(r"^\s*\d+", raw_title):
+            # 歌手なしは除外
+            if not artist:
                 continue
-        seen[key] = True
 
-        # ジャンル判定
-        genre = analyzer.detect_genre(song_title, artist)
+            # 重複判定（番号付きの重複のみ除外）
+            key = (song_title.lower(), artist.lower(), video_id, timestamp)
+            if key in seen:
+                if _LEADING_NUM_RE.match(raw_title):
+                    continue
+            else:
+                seen.add(key)
+
+            # 確度スコア計算（動画ごとに一度だけ計算・整形）
+            confidence = confidence_by_id.get(video_id)
+            if confidence is None:
+                vi = video_by_id.get(video_id)
+                score = analyzer.calculate_confidence_score(vi) if vi else 0.0
+                confidence_str = f"{score:.2f}"
+                confidence = (confidence_str, float(confidence_str))
+                confidence_by_id[video_id] = confidence
+            confidence_str, score = confidence
+
+            # ジャンル判定
+            genre = analyzer.detect_genre(song_title, artist)
         
-        # ひらがな変換
-        search_text = analyzer.to_hiragana(song_title)
+            # ひらがな変換
+            search_text = analyzer.to_hiragana(song_title)
 
-        # 日付をJSTへ
-        try:
-            dt = datetime.fromisoformat((published_at or "").replace("Z", "+00:00"))
-            date_str = dt.astimezone(timezone(timedelta(hours=9))).strftime("%Y/%m/%d")
-        except Exception:
-            date_str = ""
-
-        rows.append([
-            idx,
-            song_title,
-            artist,
-            search_text,  # ひらがな検索用
-            genre,
-            timestamp,
-            date_str,
-            video_id,
-            f"{confidence:.2f}"  # 確度スコア
-        ])
-        idx += 1
-
-    # 6. CSV出力
-    output_file = "song_timestamps_enhanced.csv"
-    with open(output_file, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア"])
-        writer.writerows(rows)
+            # 日付をJSTへ（同じ動画の行は同じ日時なので一度だけ変換）
+            date_str = date_str_by_published.get(published_at)
+            if date_str is None:
+                try:
+                    dt = datetime.fromisoformat((published_at or "").replace("Z", "+00:00"))
+                    date_str = dt.astimezone(JST).strftime("%Y/%m/%d")
+                except Exception:
+                    date_str = ""
+                date_str_by_published[published_at] = date_str
+
+            # 統計は書き込みと同時に集計
+            if score > 0.7:
+                high_conf += 1
+            elif score >= 0.4:
+                med_conf += 1
+            else:
+                low_conf += 1
+            genres[genre] = genres.get(genre, 0) + 1
+
+            yield (
+                idx,
+                song_title,
+                artist,
+                search_text,  # ひらがな検索用
+                genre,
+                timestamp,
+                date_str,
+                video_id,
+                confidence_str  # 確度スコア
+            )
+            idx += 1
+
+    # 行の生成中に例外が起きても前回のCSVを壊さないよう、一時ファイルに書いてから置き換える
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア"])
+            writer.writerows(song_rows())
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
+
+    row_count = idx - 1
 
     print(f"\n完了！CSVを出力しました: {output_file}")
     print(f"統計:")
     print(f"   - 処理した動画数: {len(filtered_video_list)}")
     print(f"   - 抽出したタイムスタンプ数: {len(all_timestamps)}")
-    print(f"   - 最終出力行数: {len(rows)}")
+    print(f"   - 最終出力行数: {row_count}")
     
     # 確度スコア統計
-    if rows:
-        scores = [float(row[8]) for row in rows]
-        high_conf = len([s for s in scores if s > 0.7])
-        med_conf = len([s for s in scores if 0.4 <= s <= 0.7])
-        low_conf = len([s for s in scores if s < 0.4])
-        
+    if row_count:
         print(f"   - 高確度 (>0.7): {high_conf}件")
         print(f"   - 中確度 (0.4-0.7): {med_conf}件")  
         print(f"   - 低確度 (<0.4): {low_conf}件")
 
     # ジャンル統計
-    genres = {}
-    for row in rows:
-        genre = row[4]
-        genres[genre] = genres.get(genre, 0) + 1
-    
     print(f"\nジャンル別統計:")
     for genre, count in sorted(genres.items(), key=lambda x: x[1], reverse=True):
         print(f"   - {genre}: {count}件")
 
     # JSONファイルも保存（バックアップ用）
-    vi_dict = [asdict(vi) for vi in filtered_video_list]
+    vi_dict = [_video_to_dict(vi) for vi in filtered_video_list]
     aligned_json_dump(vi_dict, "comment_info_enhanced.json")
     print(f"\nバックアップJSONも作成: comment_info_enhanced.json")
 
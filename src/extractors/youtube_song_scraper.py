@@ -3,11 +3,15 @@ import os
 import re
 import csv
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from dataclasses import asdict
-from typing import List, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional
 
 from googleapiclient import discovery
+from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
 # Windows環境でのcp932エンコーディングエラーを防ぐための設定
@@ -27,19 +31,13 @@ def safe_print(text):
         safe_text = str(text).encode('ascii', 'replace').decode('ascii')
         print(safe_text)
 
-# MeCabのインポート（オプション）
-try:
-    import MeCab
-    mecab_reading = MeCab.Tagger('-Oyomi')
-    safe_print("MeCab loaded successfully")
-except (ImportError, RuntimeError) as e:
-    safe_print(f"MeCab not available: {type(e).__name__}. Using simple hiragana conversion.")
-    mecab_reading = None
-
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from utils.infoclass import VideoInfo, CommentInfo, TimeStamp
 from utils.utils import aligned_json_dump
+from utils.api_cache import load_cache, save_cache
+from utils.youtube_client import ThreadLocalClient
+from utils.text_utils import SIMPLE_HIRAGANA_TABLE, has_min_timestamps, to_hiragana
 from utils.genre_classifier import GenreClassifier
 from utils.music_classifier import MusicClassifier
 
@@ -50,6 +48,25 @@ if not API_KEY:
 
 youtube = discovery.build('youtube', 'v3', developerKey=API_KEY)
 
+# 配信日はJSTで出力する
+JST = timezone(timedelta(hours=9))
+
+# コメント取得を並列化するスレッド数
+COMMENT_FETCH_WORKERS = 12
+# 並列取得でレート制限に当たった場合のリトライ回数と初回待機秒数（2倍ずつ増やす）
+COMMENT_FETCH_RETRIES = 3
+COMMENT_RETRY_DELAY = 1.0
+# コメント1ページあたりの取得件数と、キャッシュの有効期限（新しいコメントが付くため短め）
+COMMENTS_PER_PAGE = 100
+COMMENT_CACHE_TTL = 24 * 60 * 60
+# 動画一覧（uploadsプレイリスト）のキャッシュ有効期限（新着動画を拾えるよう短め）
+PLAYLIST_CACHE_TTL = 6 * 60 * 60
+# playlistItems().list の1ページあたりの件数（videos().list に一度に渡せる上限と同じ）
+PLAYLIST_PAGE_SIZE = 50
+
+# 並列取得ではワーカースレッドごとにクライアントを持つ
+_youtube_clients = ThreadLocalClient(youtube, lambda: discovery.build('youtube', 'v3', developerKey=API_KEY))
+
 # 入力チャンネルID読み込み
 try:
     user_data = json.load(open('user_ids.json', encoding='utf-8'))
@@ -64,6 +81,134 @@ except FileNotFoundError:
     with open('user_ids.json', 'w', encoding='utf-8') as f:
         json.dump(users, f, ensure_ascii=False, indent=2)
 
+# 歌枠判定・確度スコアで使うキーワード（どちらも小文字化済みのテキストに対して判定する）
+SINGING_KEYWORDS = (
+    "歌", "うた", "歌枠", "うたわく", "歌配信", "singing", "sing",
+    "カラオケ", "からおけ", "karaoke",
+    "音楽", "music", "楽曲", "ソング", "song",
+    "メドレー", "medley", "弾き語り",
+    "ライブ", "live", "演奏", "performance",
+    "アカペラ", "acappella", "コーラス", "chorus",
+    "歌ってみた", "うたってみた", "歌リレー", "歌回",
+    "リクエスト歌", "歌練習", "新曲", "cover",
+    "ボカロ", "vocaloid", "アニソン", "anime song", "anisong",
+    "セトリ", "setlist", "リハ", "リハーサル", "rehearsal",
+)
+EXCLUDE_KEYWORDS = (
+    "ゲーム", "game", "gaming", "プレイ", "play",
+    "雑談", "zatsudan", "talk", "おしゃべり", "chat",
+    "料理", "cooking", "クッキング", "食べる", "eating",
+    "お絵描き", "絵", "drawing", "art", "イラスト",
+    "工作", "craft", "作業", "work", "study", "勉強",
+)
+
+# タイトル整形・曲エントリ判定用の正規表現（行ごとに呼ばれるため事前にコンパイル）
+_FULLWIDTH_DIGITS = str.maketrans('０１２３４５６７８９', '0123456789')
+_TITLE_NUMBERING_RES = tuple(re.compile(pattern) for pattern in (
+    r"^\s*\d{1,3}[\.\。\)）\]】\-ー・]\s*",  # "01." "01。" "1)" "1】" "1-" "1・" など（全角ピリオドも含む）
+    r"^\s*[\(\(【\[]\s*\d{1,3}\s*[\)\)】\]]\s*",  # "(1)" "【1】" "[1]" など
+    r"^\s*\d{1,3}\s+",  # "01 " (数字+スペース)
+    r"^\s*[第]\d{1,3}[曲話回章]\s*",  # "第1曲" "第1話" など
+))
+# 先頭にいずれかのナンバリングがあるか（ナンバリングのないタイトルは置換を4回走らせずに済ませる）
+_TITLE_NUMBERING_RE = re.compile('|'.join(f'(?:{pattern_re.pattern})' for pattern_re in _TITLE_NUMBERING_RES))
+_BR_TAG_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_LEADING_DECORATION_RE = re.compile(r"^\s*[&＆※★☆■□◆◇●○▲△▼▽➤➡→⇒►▶►・]+\s*")
+# 先頭にナンバリング・装飾記号のいずれかが残っているか（整形が必要かの判定用）
+_TITLE_PREFIX_RE = re.compile(f'(?:{_TITLE_NUMBERING_RE.pattern})|(?:{_LEADING_DECORATION_RE.pattern})')
+_DIGITS_AND_SYMBOLS_ONLY_RE = re.compile(r'^[\d\s\.\-\(\)\[\]　]+$')
+_NUMBERING_ONLY_RE = re.compile(r'^\d+[\.\)\-\s]*$')
+_JAPANESE_CHAR_RE = re.compile(r'[ぁ-んァ-ヶー一-龯]')
+_ENGLISH_TITLE_RE = re.compile(r'^[a-zA-Z\s\-\'.!?]+$')
+_SLASH_SPLIT_RE = re.compile(r"\s*/\s*")
+_LEADING_NUMBER_RE = re.compile(r"^\s*\d+")
+
+_INVALID_TITLE_PATTERNS = [
+    r'^セトリ$',
+    r'^タイムスタンプ$',
+    r'^リスト$',
+    r'^曲目$',
+    r'^\d+曲目$',
+    r'^BGM$',
+    r'待機',
+    r'配信開始',
+    r'休憩',
+    r'ゲーム',
+    r'雑談',
+    r'実況',
+    r'テスト',
+    r'お知らせ',
+    r'告知',
+    r'^🦉',  # 絵文字で始まる
+    r'見えて実は',  # 「単純なように見えて実は...」みたいなの
+    # 初配信などのタイムスタンプ（歌ではない）
+    r'初配信',
+    r'初.*配信',  # 「初歌配信」なども除外
+    r'第一声',
+    r'自己紹介',
+    r'公開',
+    r'について',
+    r'目標',
+    r'今後',
+    r'作品',
+    r'画伯',
+    r'語る',
+    r'得意',
+]
+# いずれかに一致すれば無効なので1つの正規表現にまとめる
+_INVALID_TITLE_RE = re.compile('|'.join(f'(?:{p})' for p in _INVALID_TITLE_PATTERNS), re.IGNORECASE)
+
+# 歌枠判定・確度スコア用の正規表現
+_SINGING_CHAR_RE = re.compile(r'[歌うたウタ]')
+_MUSIC_SYMBOL_RE = re.compile(r'[♪♫♬🎵🎶🎤🎼]')
+_TIMESTAMP_RE = re.compile(r'\d{1,2}:\d{2}')
+# 有無の判定にしか使わないため、スラッシュ以降は1文字あれば十分（.+ で行末まで読まない）
+_SONG_FORMAT_RE = re.compile(r'\d{1,2}:\d{2}(?::\d{2})?[^/\n]*/.')
+_DEBUT_TITLE_RE = re.compile(r'初配信|debut|初.*配信', re.IGNORECASE)
+
+def _has_song_format(text: str) -> bool:
+    """「タイムスタンプ + 曲名 / アーティスト」形式を含むか"""
+    # スラッシュのないコメントが大半なので、正規表現を走らせる前に弾く
+    return '/' in text and _SONG_FORMAT_RE.search(text) is not None
+
+def _strip_numbering(text: str) -> str:
+    """先頭のナンバリングを除去（連続している場合は最大3回まで繰り返す）"""
+    # "01. 曲名" "1) 曲名" "【1】曲名" "(1) 曲名" など
+    # 複数のナンバリングが連続している場合もある（例: "01. 1) 曲名"）
+    for _ in range(3):
+        # どのパターンにも一致しなければ変化しないので終了
+        if not _TITLE_NUMBERING_RE.match(text):
+            break
+        for pattern_re in _TITLE_NUMBERING_RES:
+            text = pattern_re.sub("", text)
+    return text
+
+def _strip_decoration(text: str) -> str:
+    """先頭の装飾記号を除去（&, ＆, ※, ★, ☆, ■, □, ◆, ◇, ●, ○, ▲, △, ▼, ▽など）"""
+    return _LEADING_DECORATION_RE.sub("", text)
+
+def _keyword_scores(combined_text: str) -> tuple[int, int]:
+    """含まれる歌枠キーワード数と除外キーワード数を返す"""
+    singing_score = sum(1 for keyword in SINGING_KEYWORDS if keyword in combined_text)
+    exclude_score = sum(1 for keyword in EXCLUDE_KEYWORDS if keyword in combined_text)
+    return singing_score, exclude_score
+
+# 歌枠判定（コメントなし・あり）と確度スコアで同じ動画を何度も採点するため、
+# タイトル・概要欄だけで決まる部分を動画単位でキャッシュする
+@lru_cache(maxsize=8192)
+def _text_scores(title: str, description: str) -> tuple[int, int, bool]:
+    """タイトル・概要欄から（歌枠スコア, 除外スコア, タイトルに「歌」を含むか）を返す
+
+    タイトルの「歌」の加点は呼び出し側で重みが異なるため、歌枠スコアには含めない
+    """
+    combined_text = f"{title} {description}".lower()
+    singing_score, exclude_score = _keyword_scores(combined_text)
+    if _MUSIC_SYMBOL_RE.search(combined_text):
+        singing_score += 2
+    if has_min_timestamps(description, 3):
+        singing_score += 2
+    return singing_score, exclude_score, _SINGING_CHAR_RE.search(title) is not None
+
 class EnhancedAnalyzer:
     def __init__(self):
         # ジャンル分類器を初期化（JSON統合版）
@@ -71,47 +216,11 @@ class EnhancedAnalyzer:
 
     def to_hiragana(self, text: str) -> str:
         """テキストをひらがなに変換"""
-        if mecab_reading:
-            try:
-                reading = mecab_reading.parse(text).strip()
-                hiragana = ''
-                for char in reading:
-                    if 'ァ' <= char <= 'ヶ':
-                        hiragana += chr(ord(char) - ord('ァ') + ord('ぁ'))
-                    elif char == 'ヵ':
-                        hiragana += 'か'
-                    elif char == 'ヶ':
-                        hiragana += 'け'
-                    else:
-                        hiragana += char.lower()
-                return hiragana
-            except:
-                pass
-        
-        # MeCabが使えない場合の簡易変換
-        return self._simple_katakana_to_hiragana(text.lower())
+        return to_hiragana(text)
     
     def _simple_katakana_to_hiragana(self, text: str) -> str:
         """簡易カタカナ→ひらがな変換（英数字・記号も処理）"""
-        result = ''
-        for char in text:
-            if 'ァ' <= char <= 'ヶ':
-                result += chr(ord(char) - ord('ァ') + ord('ぁ'))
-            elif char == 'ヵ':
-                result += 'か'
-            elif char == 'ヶ':
-                result += 'け'
-            elif 'A' <= char <= 'Z':
-                result += char.lower()
-            elif char in '０１２３４５６７８９':
-                # 全角数字を半角に
-                result += str(ord(char) - ord('０'))
-            elif char in '（）［］｛｝':
-                # 全角括弧を除去
-                continue
-            else:
-                result += char
-        return result
+        return text.translate(SIMPLE_HIRAGANA_TABLE)
 
     def detect_genre(self, title: str, artist: str) -> str:
         """ジャンルを自動判定（JSON統合版）"""
@@ -128,50 +237,12 @@ class EnhancedAnalyzer:
         Returns:
             0.0-1.0の確度スコア
         """
-        title = video_info.title
-        description = video_info.description
-
         # 既存のis_singing_stream関数と同じロジック
-        combined_text = f"{title} {description}".lower()
-        singing_keywords = [
-            "歌", "うた", "歌枠", "うたわく", "歌配信", "singing", "sing",
-            "カラオケ", "からおけ", "karaoke",
-            "音楽", "music", "楽曲", "ソング", "song",
-            "メドレー", "medley", "弾き語り",
-            "ライブ", "live", "演奏", "performance",
-            "アカペラ", "acappella", "コーラス", "chorus",
-            "歌ってみた", "うたってみた", "歌リレー", "歌回",
-            "リクエスト歌", "歌練習", "新曲", "cover",
-            "ボカロ", "vocaloid", "アニソン", "anime song", "anisong",
-            "セトリ", "setlist", "リハ", "リハーサル", "rehearsal"
-        ]
-        exclude_keywords = [
-            "ゲーム", "game", "gaming", "プレイ", "play",
-            "雑談", "zatsudan", "talk", "おしゃべり", "chat",
-            "料理", "cooking", "クッキング", "食べる", "eating",
-            "お絵描き", "絵", "drawing", "art", "イラスト",
-            "工作", "craft", "作業", "work", "study", "勉強"
-        ]
-
-        singing_score = 0
-        for keyword in singing_keywords:
-            if keyword in combined_text:
-                singing_score += 1
-
-        exclude_score = 0
-        for keyword in exclude_keywords:
-            if keyword in combined_text:
-                exclude_score += 1
+        singing_score, exclude_score, has_singing_char = _text_scores(video_info.title, video_info.description)
 
         # タイトルの重要なパターン（重み増加）
-        if re.search(r'[歌うたウタ]', title):
+        if has_singing_char:
             singing_score += 5  # 3→5に増加（最も信頼できるシグナル）
-        if re.search(r'[♪♫♬🎵🎶🎤🎼]', combined_text):
-            singing_score += 2
-
-        timestamp_count = len(re.findall(r'\d{1,2}:\d{2}', description))
-        if timestamp_count >= 3:
-            singing_score += 2
 
         # コメント分析による追加スコア
         if hasattr(video_info, 'comments') and video_info.comments:
@@ -180,13 +251,12 @@ class EnhancedAnalyzer:
 
             for comment in video_info.comments:
                 comment_text = comment.text_display if hasattr(comment, 'text_display') else str(comment)
-                comment_timestamps = len(re.findall(r'\d{1,2}:\d{2}', comment_text))
-                if comment_timestamps >= 3:
+                if has_min_timestamps(comment_text, 3):
                     comment_timestamp_count += 1
 
                 # タイムスタンプ + 「曲名 / アーティスト」形式を検出
                 # HTMLタグも考慮（YouTubeコメントは<a>タグを含む）
-                if re.search(r'\d{1,2}:\d{2}(?::\d{2})?[^/\n]*/.+', comment_text):
+                if _has_song_format(comment_text):
                     song_format_count += 1
 
             # コメントに多数のタイムスタンプがある場合、歌配信の可能性が高い
@@ -241,34 +311,12 @@ class EnhancedAnalyzer:
     def clean_title(self, text: str) -> str:
         """先頭ナンバリングを除去"""
         # 全角数字を半角に統一
-        text = text.translate(str.maketrans('０１２３４５６７８９', '0123456789'))
-
-        # より包括的なナンバリングパターン（複数回適用して再帰的に除去）
-        # "01. 曲名" "1) 曲名" "【1】曲名" "(1) 曲名" など
-        # 複数のナンバリングが連続している場合もある（例: "01. 1) 曲名"）
-        max_iterations = 3  # 最大3回繰り返す
-
-        for _ in range(max_iterations):
-            original = text
-            patterns = [
-                r"^\s*\d{1,3}[\.\。\)）\]】\-ー・]\s*",  # "01." "01。" "1)" "1】" "1-" "1・" など（全角ピリオドも含む）
-                r"^\s*[\(\(【\[]\s*\d{1,3}\s*[\)\)】\]]\s*",  # "(1)" "【1】" "[1]" など
-                r"^\s*\d{1,3}\s+",  # "01 " (数字+スペース)
-                r"^\s*[第]\d{1,3}[曲話回章]\s*",  # "第1曲" "第1話" など
-            ]
-
-            for pattern in patterns:
-                text = re.sub(pattern, "", text)
-
-            # 変化がなくなったら終了
-            if text == original:
-                break
-
-        text = re.sub(r"<br\s*/?>", " ", text, flags=re.IGNORECASE)
-
-        # 先頭の装飾記号を除去（&, ＆, ※, ★, ☆, ■, □, ◆, ◇, ●, ○, ▲, △, ▼, ▽など）
-        text = re.sub(r"^\s*[&＆※★☆■□◆◇●○▲△▼▽➤➡→⇒►▶►・]+\s*", "", text)
-
+        text = text.translate(_FULLWIDTH_DIGITS)
+        text = _strip_numbering(text)
+        # 行全体を走査する置換は<br>がありうる場合だけ行う（ナンバリング・装飾は先頭のみ照合）
+        if '<' in text:
+            text = _BR_TAG_RE.sub(" ", text)
+        text = _strip_decoration(text)
         return text.strip()
 
     def is_valid_song_entry(self, title: str, artist: str) -> bool:
@@ -278,51 +326,16 @@ class EnhancedAnalyzer:
             return False
 
         # 数字と記号のみで構成されている場合は無効
-        if re.match(r'^[\d\s\.\-\(\)\[\]　]+$', title):
+        if _DIGITS_AND_SYMBOLS_ONLY_RE.match(title):
             return False
 
         # ナンバリングパターンのみ（"01." "1)" など）の場合は無効
-        if re.match(r'^\d+[\.\)\-\s]*$', title):
+        if _NUMBERING_ONLY_RE.match(title):
             return False
 
         # 無効なキーワードパターン（明らかにゴミ）
-        invalid_patterns = [
-            r'^セトリ$',
-            r'^タイムスタンプ$',
-            r'^リスト$',
-            r'^曲目$',
-            r'^\d+曲目$',
-            r'^BGM$',
-            r'待機',
-            r'配信開始',
-            r'休憩',
-            r'ゲーム',
-            r'雑談',
-            r'実況',
-            r'テスト',
-            r'お知らせ',
-            r'告知',
-            r'^🦉',  # 絵文字で始まる
-            r'見えて実は',  # 「単純なように見えて実は...」みたいなの
-            # 初配信などのタイムスタンプ（歌ではない）
-            r'初配信',
-            r'初.*配信',  # 「初歌配信」なども除外
-            r'第一声',
-            r'自己紹介',
-            r'公開',
-            r'について',
-            r'目標',
-            r'今後',
-            r'作品',
-            r'画伯',
-            r'語る',
-            r'得意',
-        ]
-
-        title_lower = title.lower()
-        for pattern in invalid_patterns:
-            if re.search(pattern, title, re.IGNORECASE):
-                return False
+        if _INVALID_TITLE_RE.search(title):
+            return False
 
         # アーティスト名がある場合はOK
         if artist and artist.strip():
@@ -334,11 +347,11 @@ class EnhancedAnalyzer:
             return False
 
         # 2. 日本語の曲名らしいパターン（ひらがな・カタカナ・漢字が含まれる）
-        if re.search(r'[ぁ-んァ-ヶー一-龯]', title):
+        if _JAPANESE_CHAR_RE.search(title):
             return True
 
         # 3. 英語の曲名らしいパターン（英字が主体）
-        if re.match(r'^[a-zA-Z\s\-\'.!?]+$', title) and len(title.strip()) >= 3:
+        if _ENGLISH_TITLE_RE.match(title) and len(title.strip()) >= 3:
             return True
 
         # それ以外のアーティスト名なしエントリは無効
@@ -349,52 +362,35 @@ class EnhancedAnalyzer:
         title = self.clean_title(title)
 
         # 「曲 / 歌手」形式で分割
-        parts = re.split(r"\s*/\s*", title, maxsplit=1)
+        parts = _SLASH_SPLIT_RE.split(title, maxsplit=1)
         if len(parts) == 2:
-            # 分割後も各部分に対してclean_titleを適用（ナンバリングが曲名側に残っている場合）
-            song_title = self.clean_title(parts[0].strip())
+            # 全角数字・<br>は整形済みなので、曲名側に残ったナンバリング・装飾だけを除去する
+            song_title = parts[0].strip()
+            if _TITLE_PREFIX_RE.match(song_title):
+                song_title = _strip_decoration(_strip_numbering(song_title)).strip()
             artist = parts[1].strip()
             return song_title, artist
         else:
             return title.strip(), ""
 
-def is_singing_stream(title: str, description: str, comments: Optional[List[str]] = None) -> bool:
+@lru_cache(maxsize=8192)
+def _timestamp_to_seconds(timestamp: str) -> int:
+    """「mm:ss」「hh:mm:ss」を秒に変換（同じ表記は何度も現れるのでキャッシュする）"""
+    time_parts = timestamp.split(':')
+    try:
+        if len(time_parts) == 2:  # mm:ss
+            return int(time_parts[0]) * 60 + int(time_parts[1])
+        if len(time_parts) == 3:  # hh:mm:ss
+            return int(time_parts[0]) * 3600 + int(time_parts[1]) * 60 + int(time_parts[2])
+    except ValueError:
+        pass
+    return 0
+
+def is_singing_stream(title: str, description: str, comments: Optional[Iterable[str]] = None) -> bool:
     """歌動画判定ロジック（コメント分析強化版）"""
-    combined_text = f"{title} {description}".lower()
-    singing_keywords = [
-        "歌", "うた", "歌枠", "うたわく", "歌配信", "singing", "sing",
-        "カラオケ", "からおけ", "karaoke",
-        "音楽", "music", "楽曲", "ソング", "song",
-        "メドレー", "medley", "弾き語り",
-        "ライブ", "live", "演奏", "performance",
-        "アカペラ", "acappella", "コーラス", "chorus",
-        "歌ってみた", "うたってみた", "歌リレー", "歌回",
-        "リクエスト歌", "歌練習", "新曲", "cover",
-        "ボカロ", "vocaloid", "アニソン", "anime song", "anisong",
-        "セトリ", "setlist", "リハ", "リハーサル", "rehearsal"
-    ]
-    exclude_keywords = [
-        "ゲーム", "game", "gaming", "プレイ", "play",
-        "雑談", "zatsudan", "talk", "おしゃべり", "chat",
-        "料理", "cooking", "クッキング", "食べる", "eating",
-        "お絵描き", "絵", "drawing", "art", "イラスト",
-        "工作", "craft", "作業", "work", "study", "勉強"
-    ]
-    singing_score = 0
-    for keyword in singing_keywords:
-        if keyword in combined_text:
-            singing_score += 1
-    exclude_score = 0
-    for keyword in exclude_keywords:
-        if keyword in combined_text:
-            exclude_score += 1
-    if re.search(r'[歌うたウタ]', title):
+    singing_score, exclude_score, has_singing_char = _text_scores(title, description)
+    if has_singing_char:
         singing_score += 3
-    if re.search(r'[♪♫♬🎵🎶🎤🎼]', combined_text):
-        singing_score += 2
-    timestamp_count = len(re.findall(r'\d{1,2}:\d{2}', description))
-    if timestamp_count >= 3:
-        singing_score += 2
 
     # コメント分析による追加スコア
     if comments:
@@ -402,14 +398,13 @@ def is_singing_stream(title: str, description: str, comments: Optional[List[str]
         song_format_count = 0  # 「曲名 / アーティスト」形式のカウント
 
         for comment in comments:
-            comment_timestamps = len(re.findall(r'\d{1,2}:\d{2}', comment))
-            if comment_timestamps >= 3:  # 1コメントに3つ以上のタイムスタンプ
+            if has_min_timestamps(comment, 3):  # 1コメントに3つ以上のタイムスタンプ
                 comment_timestamp_count += 1
 
             # タイムスタンプ + 「曲名 / アーティスト」形式を検出
             # 例: "43:00 蝶々結び / Aimer" や "1:23:45 曲名/歌手"
             # HTMLタグも考慮（YouTubeコメントは<a>タグを含む）
-            if re.search(r'\d{1,2}:\d{2}(?::\d{2})?[^/\n]*/.+', comment):
+            if _has_song_format(comment):
                 song_format_count += 1
 
         # コメントに多数のタイムスタンプがある場合、歌配信の可能性が高い
@@ -449,6 +444,8 @@ def merge_with_existing_csv(csv_file: str, new_rows: list) -> list:
 
     try:
         existing_rows = []
+        # 重複チェック用のキー (動画ID, タイムスタンプ) は読み込みと同時に集める
+        existing_keys = set()
         with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
             reader = csv.reader(f)
             header = next(reader, None)  # ヘッダーをスキップ
@@ -461,9 +458,8 @@ def merge_with_existing_csv(csv_file: str, new_rows: list) -> list:
                 if not has_channel_id and len(row) == 9:
                     row.append('')  # チャンネルID列を空で追加
                 existing_rows.append(row)
+                existing_keys.add((row[7], row[5]))
 
-        # 重複チェック用のキー (動画ID + タイムスタンプ)
-        existing_keys = {(row[7], row[5]) for row in existing_rows}  # (動画ID, タイムスタンプ)
         new_unique_rows = []
 
         for row in new_rows:
@@ -476,6 +472,7 @@ def merge_with_existing_csv(csv_file: str, new_rows: list) -> list:
         merged = existing_rows + new_unique_rows
 
         # 配信日でソート（古い順）
+        # 既存行は前回ソート済みの並びなので、timsortはほぼ新規行の分だけで済む
         merged.sort(key=lambda x: (x[6], x[5]))  # 配信日、タイムスタンプでソート
 
         # 連番を振り直す
@@ -493,6 +490,11 @@ def get_uploads_playlist_id(channel_id: str) -> str | None:
     """既存関数をそのまま使用"""
     if not channel_id or not channel_id.startswith("UC"):
         return None
+
+    cached = load_cache('uploads', channel_id)
+    if cached is not None:
+        return cached
+
     try:
         resp = youtube.channels().list(
             part="contentDetails",
@@ -502,12 +504,55 @@ def get_uploads_playlist_id(channel_id: str) -> str | None:
         items = resp.get("items", [])
         if not items:
             return None
-        return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        uploads_id = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        save_cache('uploads', channel_id, uploads_id)
+        return uploads_id
     except Exception as e:
         safe_print(f"チャンネル {channel_id} の uploads プレイリスト取得でエラー: {e}")
         return None
 
-def get_video_info_in_playlist(playlist_id: str, published_after: str = None, channel_id: str = None) -> list[VideoInfo]:
+def is_singing_candidate(vi: VideoInfo) -> bool:
+    """コメント取得前の歌枠候補判定（歌枠判定・概要欄のタイムスタンプ・初配信のいずれか）"""
+    if is_singing_stream(vi.title, vi.description):
+        return True
+    # 概要欄にタイムスタンプが1つ以上ある場合は通す
+    if _TIMESTAMP_RE.search(vi.description):
+        return True
+    # 初配信など特別な動画も通す（コメントにタイムスタンプがある可能性）
+    return _DEBUT_TITLE_RE.search(vi.title) is not None
+
+def _iter_playlist_snippet_pages(playlist_id: str, use_cache: bool) -> Iterator[list]:
+    """プレイリストの動画snippetをページ（最大50件）単位で返す
+
+    use_cache=True の場合、最後まで取得できた一覧をキャッシュして次回はAPIを呼ばない
+    （途中で打ち切られた・失敗した一覧は保存しない）
+    """
+    if use_cache:
+        snippets = load_cache('playlist_items', playlist_id, ttl=PLAYLIST_CACHE_TTL)
+        if snippets is not None:
+            for start in range(0, len(snippets), PLAYLIST_PAGE_SIZE):
+                yield snippets[start:start + PLAYLIST_PAGE_SIZE]
+            return
+
+    snippets = []
+    request = youtube.playlistItems().list(
+        part="snippet",
+        playlistId=playlist_id,
+        maxResults=PLAYLIST_PAGE_SIZE,
+        fields="nextPageToken,items/snippet(publishedAt,title,description,resourceId/videoId)"
+    )
+    while request:
+        response = request.execute()
+        page = [i["snippet"] for i in response.get("items", [])]
+        snippets.extend(page)
+        yield page
+        request = youtube.playlistItems().list_next(request, response)
+
+    if use_cache:
+        save_cache('playlist_items', playlist_id, snippets)
+
+def get_video_info_in_playlist(playlist_id: str, published_after: str = None, channel_id: str = None,
+                               filter_fn: Optional[Callable[[VideoInfo], bool]] = None) -> list[VideoInfo]:
     """
     プレイリストから動画情報を取得（差分更新対応）
 
@@ -515,29 +560,22 @@ def get_video_info_in_playlist(playlist_id: str, published_after: str = None, ch
         playlist_id: プレイリストID
         published_after: この日付以降の動画のみ取得（ISO 8601形式）
         channel_id: チャンネルID（VideoInfoに設定）
+        filter_fn: 指定した場合、Trueを返した動画のみ詳細を取得して返す
     """
     video_info_list: list[VideoInfo] = []
+    skipped_count = 0
     try:
-        request = youtube.playlistItems().list(
-            part="snippet",
-            playlistId=playlist_id,
-            maxResults=50,
-            fields="nextPageToken,items/snippet(publishedAt,title,description,resourceId/videoId)"
-        )
-
         filter_date = None
         if published_after:
             filter_date = datetime.fromisoformat(published_after.replace("Z", "+00:00"))
 
-        while request:
-            response = request.execute()
-            items = response.get("items", [])
-
+        # 差分更新では古い動画に到達した時点で打ち切るため、一覧のキャッシュは全件取得時のみ使う
+        for snippets in _iter_playlist_snippet_pages(playlist_id, use_cache=filter_date is None):
             should_break = False
-            for i in items:
-                vi = VideoInfo.from_response_snippet(i["snippet"])
+            page_videos: list[VideoInfo] = []
+            for snippet in snippets:
+                vi = VideoInfo.from_response_snippet(snippet)
                 vi.channel_id = channel_id  # チャンネルIDを設定
-                vid = vi.id
 
                 # 日付フィルタリング（古い動画が出てきたら終了）
                 if filter_date:
@@ -550,57 +588,115 @@ def get_video_info_in_playlist(playlist_id: str, published_after: str = None, ch
                     except Exception as e:
                         safe_print(f"  ! 日付パースエラー: {e}")
 
-                # --- 動画詳細を追加で取得 ---
+                # 対象外の動画は詳細取得もしない
+                if filter_fn is not None and not filter_fn(vi):
+                    skipped_count += 1
+                    continue
+
+                page_videos.append(vi)
+
+            # 配信開始時刻がキャッシュ済みの動画は詳細取得を省く
+            uncached: list[VideoInfo] = []
+            for vi in page_videos:
+                stream_start = load_cache('stream_start', vi.id)
+                if stream_start is None:
+                    uncached.append(vi)
+                else:
+                    vi.stream_start = stream_start
+
+            # --- 動画詳細をページ単位（最大50件）でまとめて取得 ---
+            if uncached:
                 try:
                     details = youtube.videos().list(
                         part="liveStreamingDetails,snippet",
-                        id=vid,
-                        fields="items(snippet/publishedAt,liveStreamingDetails/actualStartTime)"
+                        id=",".join(vi.id for vi in uncached),
+                        fields="items(id,snippet/publishedAt,liveStreamingDetails(actualStartTime,scheduledStartTime))"
                     ).execute()
 
-                    if details.get("items"):
-                        item = details["items"][0]
-                        vi.stream_start = item.get("liveStreamingDetails", {}).get("actualStartTime")
-                        if not vi.stream_start:
-                            vi.stream_start = item["snippet"]["publishedAt"]
+                    items_by_id = {item["id"]: item for item in details.get("items", [])}
+                    for vi in uncached:
+                        item = items_by_id.get(vi.id)
+                        if item:
+                            vi.stream_start = item.get("liveStreamingDetails", {}).get("actualStartTime")
+                            if not vi.stream_start:
+                                vi.stream_start = item["snippet"]["publishedAt"]
+                            # 開始前の配信は開始時刻が確定していないのでキャッシュしない
+                            live_details = item.get("liveStreamingDetails")
+                            if not live_details or live_details.get("actualStartTime"):
+                                save_cache('stream_start', vi.id, vi.stream_start)
 
                 except Exception as e:
-                    safe_print(f"動画 {vid} の詳細取得でエラー: {e}")
+                    safe_print(f"動画 {uncached[0].id} ほか{len(uncached)}件の詳細取得でエラー: {e}")
 
-                video_info_list.append(vi)
+            video_info_list.extend(page_videos)
 
             if should_break:
                 break
-
-            request = youtube.playlistItems().list_next(request, response)
     except Exception as e:
         safe_print(f"プレイリスト {playlist_id} の取得でエラー: {e}")
+    if skipped_count:
+        safe_print(f"  プレイリスト {playlist_id}: 対象外の動画 {skipped_count}件をスキップ")
     return video_info_list
 
+def _is_rate_limited(error: HttpError) -> bool:
+    """待てば解消するレート制限エラーか（quotaExceededやcommentsDisabledは待っても無駄）"""
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and b'ratelimitexceeded' in (error.content or b'').lower()
+
 def get_comments(video_id: str) -> list[CommentInfo]:
-    """既存関数をそのまま使用"""
+    """既存関数をそのまま使用（取得結果はディスクにキャッシュする）"""
+    # 強化版スクレイパーと同じ取得内容なのでキャッシュも共有する
+    cache_key = f"{video_id}_{COMMENTS_PER_PAGE}"
+    cached = load_cache('comment_threads', cache_key, ttl=COMMENT_CACHE_TTL)
+    if cached is not None:
+        return [CommentInfo.from_json(c) for c in cached]
+
     comment_list: list[CommentInfo] = []
     comment_field = "snippet(videoId,textDisplay,textOriginal)"
     top_comment_f = f"items/snippet/topLevelComment/{comment_field}"
     replies_f = f"items/replies/comments/{comment_field}"
 
+    youtube = _youtube_clients.get()
     try:
         request = youtube.commentThreads().list(
             part="snippet,replies",
-            maxResults=100,
+            maxResults=COMMENTS_PER_PAGE,
             videoId=video_id,
             fields=f"nextPageToken,{top_comment_f},{replies_f}"
         )
         while request:
-            response = request.execute()
+            for attempt in range(COMMENT_FETCH_RETRIES):
+                try:
+                    response = request.execute()
+                    break
+                except HttpError as e:
+                    if attempt == COMMENT_FETCH_RETRIES - 1 or not _is_rate_limited(e):
+                        raise
+                    wait_time = (2 ** attempt) * COMMENT_RETRY_DELAY
+                    safe_print(f"API制限に到達。{wait_time}秒待機中...")
+                    time.sleep(wait_time)
             for item in response.get("items", []):
                 comment_list.extend(CommentInfo.response_item_to_comments(item))
             request = youtube.commentThreads().list_next(request, response)
+        # 途中で失敗した一覧はキャッシュしない
+        save_cache('comment_threads', cache_key, [dict(vars(c)) for c in comment_list])
     except Exception as e:
         safe_print(f"動画 {video_id} のコメント取得でエラー: {e}")
 
     return comment_list
 
+def _video_to_dict(vi: VideoInfo) -> dict:
+    """VideoInfoをJSON用のdictに変換（フィールドは平坦なのでasdictの再帰コピーは不要）"""
+    return {**vars(vi), 'comments': [vars(c) for c in vi.comments]}
+
+def _index_videos_by_id(videos: Iterable[VideoInfo]) -> dict[str, VideoInfo]:
+    """動画ID→動画情報の辞書を作る（複数チャンネルの一覧に載る動画は最初に見つかった方を使う）"""
+    video_by_id: dict[str, VideoInfo] = {}
+    for vi in videos:
+        video_by_id.setdefault(vi.id, vi)
+    return video_by_id
+
 def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_timestamps_complete.csv", filter_singing_only: bool = False, incremental: bool = True):
     """
     指定されたチャンネルIDリストをスクレイプする
@@ -645,30 +741,28 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
         else:
             safe_print(f"取得失敗: {uc}")
 
-    video_info_list: list[VideoInfo] = []
+    # 2. フィルタリング（歌枠モードでは一覧取得時に歌枠候補だけを残し、対象外の動画の詳細取得を省く）
+    # 一覧に載っていた動画の総数は、判定に回ってきた件数として数える
+    listed_count = 0
+
+    def count_singing_candidate(vi: VideoInfo) -> bool:
+        nonlocal listed_count
+        listed_count += 1
+        return is_singing_candidate(vi)
+
+    filter_fn = count_singing_candidate if filter_singing_only else None
+    filtered_video_list: list[VideoInfo] = []
     for upid, channel_id in channel_uploads_map.items():
-        video_info_list += get_video_info_in_playlist(upid, published_after=published_after, channel_id=channel_id)
+        filtered_video_list += get_video_info_in_playlist(
+            upid, published_after=published_after, channel_id=channel_id, filter_fn=filter_fn
+        )
 
-    # 2. フィルタリング
     if filter_singing_only:
-        # 歌枠フィルタリング（歌枠のみ）
-        filtered_video_list = []
-        for vi in video_info_list:
-            # 歌枠判定 or 概要欄にタイムスタンプが1つ以上ある場合は通す
-            has_timestamp_in_desc = len(re.findall(r'\d{1,2}:\d{2}', vi.description)) >= 1
-            # 初配信など特別な動画も通す（コメントにタイムスタンプがある可能性）
-            is_debut_or_special = bool(re.search(r'初配信|debut|初.*配信', vi.title, re.IGNORECASE))
-            
-            if is_singing_stream(vi.title, vi.description) or has_timestamp_in_desc or is_debut_or_special:
-                filtered_video_list.append(vi)
-        safe_print(f"全動画数: {len(video_info_list)}, 歌枠動画数: {len(filtered_video_list)}")
+        safe_print(f"全動画数: {listed_count}, 歌枠動画数: {len(filtered_video_list)}")
         safe_print("\n=== 歌枠として検出された動画 ===")
     else:
-        # すべての動画を対象
-        filtered_video_list = []
-        for vi in video_info_list:
-            filtered_video_list.append(vi)
-        safe_print(f"全動画数: {len(video_info_list)}, 処理対象動画数: {len(filtered_video_list)}")
+        # フィルタなしでは一覧の全動画が処理対象になる
+        safe_print(f"全動画数: {len(filtered_video_list)}, 処理対象動画数: {len(filtered_video_list)}")
         safe_print("\n=== 処理対象の動画 ===")
     for i, vi in enumerate(filtered_video_list[:10]):
         try:
@@ -683,16 +777,18 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
     safe_print("\nコメントを取得中...")
     filter_singing_only = False  # すべての動画を対象とする
     secondary_filtered_list = []
-    for i, video_info in enumerate(filtered_video_list):
+    with ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS) as executor:
+        comment_lists = list(executor.map(get_comments, [vi.id for vi in filtered_video_list]))
+    for i, (video_info, comments) in enumerate(zip(filtered_video_list, comment_lists)):
         try:
             safe_print(f"{i+1}/{len(filtered_video_list)}: {video_info.title}")
         except UnicodeEncodeError:
             safe_print(f"{i+1}/{len(filtered_video_list)}: [title with emoji]")
-        video_info.comments = get_comments(video_info.id)
+        video_info.comments = comments
 
         if filter_singing_only:
             # 歌枠フィルタリング：コメント分析で再判定
-            comment_texts = [c.text_display for c in video_info.comments] if video_info.comments else []
+            comment_texts = (c.text_display for c in video_info.comments or ())
             if is_singing_stream(video_info.title, video_info.description, comment_texts):
                 secondary_filtered_list.append(video_info)
             else:
@@ -721,10 +817,9 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
 
     # 5. CSV形式に変換（重複除去強化版）
     safe_print("\nCSV形式に変換中...")
-    rows = []
-    seen = {}
-    duplicate_groups = {}
-    idx = 1
+    best_by_key = {}  # 重複グループごとに最適な1件だけ保持
+    video_by_id = _index_videos_by_id(filtered_video_list)
+    confidence_by_id: dict[str, float] = {}
 
     for entry in all_timestamps:
         video_id = entry.video_id
@@ -732,30 +827,12 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
         timestamp = entry.timestamp
         published_at = getattr(entry, 'stream_start', None) or entry.published_at
 
-        confidence = 0.0
-        video_channel_id = None
-        for vi in filtered_video_list:
-            if vi.id == video_id:
-                # 改善版：動画のタイムスタンプを渡す
-                ts_for_video = video_timestamps_map.get(video_id, [])
-                confidence = analyzer.calculate_confidence_score(vi, ts_for_video)
-                video_channel_id = vi.channel_id  # チャンネルIDを取得
-                break
-
         song_title, artist = analyzer.parse_song_title_artist(raw_title)
 
         if not analyzer.is_valid_song_entry(song_title, artist):
             continue
 
-        time_parts = timestamp.split(':')
-        total_seconds = 0
-        try:
-            if len(time_parts) == 2:
-                total_seconds = int(time_parts[0]) * 60 + int(time_parts[1])
-            elif len(time_parts) == 3:
-                total_seconds = int(time_parts[0]) * 3600 + int(time_parts[1]) * 60 + int(time_parts[2])
-        except:
-            total_seconds = 0
+        total_seconds = _timestamp_to_seconds(timestamp)
 
         normalized_key = (
             song_title.lower().strip(),
@@ -764,31 +841,43 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
             total_seconds // 5
         )
 
-        if normalized_key not in duplicate_groups:
-            duplicate_groups[normalized_key] = []
-
-        duplicate_groups[normalized_key].append({
-            'raw_title': raw_title,
-            'song_title': song_title,
-            'artist': artist,
-            'timestamp': timestamp,
-            'total_seconds': total_seconds,
-            'video_id': video_id,
-            'published_at': published_at,
-            'confidence': confidence,
-            'has_numbering': bool(re.match(r"^\s*\d+", raw_title))
-        })
+        # 優先順位: ナンバリングなし > 詳細な曲名 > 長い曲名（同点なら先に出たものを残す）
+        rank = (
+            not _LEADING_NUMBER_RE.match(raw_title),
+            len(song_title),
+            len(artist)
+        )
+        current = best_by_key.get(normalized_key)
+        if current is None or rank > current['rank']:
+            # 確度スコア計算（残す行がある動画だけ、動画ごとに一度だけ計算）
+            vi = video_by_id.get(video_id)
+            confidence = confidence_by_id.get(video_id)
+            if confidence is None:
+                # 改善版：動画のタイムスタンプを渡す
+                confidence = analyzer.calculate_confidence_score(vi, video_timestamps_map.get(video_id, [])) if vi else 0.0
+                confidence_by_id[video_id] = confidence
+            best_by_key[normalized_key] = {
+                'rank': rank,
+                'song_title': song_title,
+                'artist': artist,
+                'timestamp': timestamp,
+                'total_seconds': total_seconds,
+                'video_id': video_id,
+                'published_at': published_at,
+                'confidence': confidence,
+                'channel_id': vi.channel_id if vi else None  # チャンネルIDを取得
+            }
 
     # 音楽分類器を初期化
     music_classifier = MusicClassifier(request_delay=3.0)
 
+    date_str_by_published: dict[str, str] = {}
+
+    singing_rows = []
+    other_rows = []
+
     safe_print("\n[*] タイムスタンプを分類中...")
-    for normalized_key, duplicates in duplicate_groups.items():
-        best = max(duplicates, key=lambda x: (
-            not x['has_numbering'],
-            len(x['song_title']),
-            len(x['artist'])
-        ))
+    for best in best_by_key.values():
 
         # 音楽かどうかを判定し、必要に応じてアーティスト情報を補完
         classification = music_classifier.classify_timestamp(
@@ -800,14 +889,19 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
         genre = analyzer.detect_genre(classification['title'], classification['artist'])
         search_text = analyzer.to_hiragana(classification['title'])
 
-        try:
-            dt = datetime.fromisoformat((best['published_at'] or "").replace("Z", "+00:00"))
-            date_str = dt.astimezone(timezone(timedelta(hours=9))).strftime("%Y/%m/%d")
-        except Exception:
-            date_str = ""
+        # 日付をJSTへ（同じ動画の行は同じ日時なので一度だけ変換）
+        published_at = best['published_at']
+        date_str = date_str_by_published.get(published_at)
+        if date_str is None:
+            try:
+                dt = datetime.fromisoformat((published_at or "").replace("Z", "+00:00"))
+                date_str = dt.astimezone(JST).strftime("%Y/%m/%d")
+            except Exception:
+                date_str = ""
+            date_str_by_published[published_at] = date_str
 
         row_data = [
-            idx,
+            0,  # 連番はソート後に振る
             classification['title'],
             classification['artist'],
             search_text,
@@ -816,35 +910,19 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
             date_str,
             best['video_id'],
             f"{best['confidence']:.2f}",
-            video_channel_id,  # チャンネルID
-            best['total_seconds'],
-            classification['is_music']  # 音楽かどうかのフラグを追加
+            best['channel_id']  # チャンネルID
         ]
-        rows.append(row_data)
-        idx += 1
-
-    rows.sort(key=lambda x: (x[6], x[9]))
-
-    # 歌とその他に分類
-    singing_rows = []
-    other_rows = []
-
-    for i, row in enumerate(rows, 1):
-        row[0] = i
-        is_music = row.pop()  # is_musicフラグを取り出す
-        total_seconds = row.pop()  # total_secondsを削除
-        # channel_idはそのまま残す（row[8]）
-
-        if is_music:
-            singing_rows.append(row)
+        # 歌とその他に分類
+        if classification['is_music']:
+            singing_rows.append(row_data)
         else:
-            other_rows.append(row)
+            other_rows.append(row_data)
 
-    # 再度連番を振り直す
-    for i, row in enumerate(singing_rows, 1):
-        row[0] = i
-    for i, row in enumerate(other_rows, 1):
-        row[0] = i
+    # ファイルごとにソートして連番を振る（安定ソートなので全体をソートしてから分けた場合と同じ順序）
+    for output_rows in (singing_rows, other_rows):
+        output_rows.sort(key=lambda x: (x[6], x[9]))
+        for i, row in enumerate(output_rows, 1):
+            row[0] = i
 
     # 6. 既存CSVとマージ（差分更新の場合）
     output_dir = os.path.dirname(output_file)
@@ -859,17 +937,17 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
         other_rows = merge_with_existing_csv(output_other, other_rows)
         safe_print(f"\n[差分更新] 既存データとマージしました")
 
-    with open(output_singing, "w", encoding="utf-8-sig", newline="") as f:
+    with open(output_singing, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア","チャンネルID"])
         writer.writerows(singing_rows)
 
-    with open(output_other, "w", encoding="utf-8-sig", newline="") as f:
+    with open(output_other, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア","チャンネルID"])
         writer.writerows(other_rows)
 
-    rows = singing_rows + other_rows  # 統計表示用に結合
+    total_rows = len(singing_rows) + len(other_rows)
 
     safe_print(f"\n完了！CSVを出力しました:")
     safe_print(f"   - 歌枠: {output_singing} ({len(singing_rows)}件)")
@@ -877,32 +955,36 @@ def scrape_channels(channel_ids: List[str], output_file: str = "output/csv/song_
     safe_print(f"\n統計:")
     safe_print(f"   - 処理した動画数: {len(filtered_video_list)}")
     safe_print(f"   - 抽出したタイムスタンプ数: {len(all_timestamps)}")
-    safe_print(f"   - 最終出力行数: {len(rows)}")
-
-    if rows:
-        # 確度スコア統計
-        scores = [float(row[8]) for row in rows]
-        high_conf = len([s for s in scores if s > 0.7])
-        med_conf = len([s for s in scores if 0.4 <= s <= 0.7])
-        low_conf = len([s for s in scores if s < 0.4])
-
-        safe_print(f"\n   確度スコア分布:")
-        safe_print(f"   - 高確度 (>0.7): {high_conf}件 ({high_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 中確度 (0.4-0.7): {med_conf}件 ({med_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 低確度 (<0.4): {low_conf}件 ({low_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 平均確度: {sum(scores)/len(scores):.2f}")
+    safe_print(f"   - 最終出力行数: {total_rows}")
 
-        # ジャンル別統計
+    if total_rows:
+        # 確度スコア・ジャンル別統計を1回の走査で集計（2ファイル分の行を結合しない）
+        high_conf = med_conf = low_conf = 0
+        score_total = 0.0
         genre_stats = {}
-        for row in rows:
+        for row in chain(singing_rows, other_rows):
+            s = float(row[8])
+            score_total += s
+            if s > 0.7:
+                high_conf += 1
+            elif s >= 0.4:
+                med_conf += 1
+            else:
+                low_conf += 1
             genre = row[4]  # ジャンル列
             genre_stats[genre] = genre_stats.get(genre, 0) + 1
 
+        safe_print(f"\n   確度スコア分布:")
+        safe_print(f"   - 高確度 (>0.7): {high_conf}件 ({high_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 中確度 (0.4-0.7): {med_conf}件 ({med_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 低確度 (<0.4): {low_conf}件 ({low_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 平均確度: {score_total/total_rows:.2f}")
+
         safe_print(f"\n   ジャンル別統計:")
         for genre, count in sorted(genre_stats.items(), key=lambda x: x[1], reverse=True):
-            safe_print(f"   - {genre}: {count}曲 ({count/len(rows)*100:.1f}%)")
+            safe_print(f"   - {genre}: {count}曲 ({count/total_rows*100:.1f}%)")
 
-    vi_dict = [asdict(vi) for vi in filtered_video_list]
+    vi_dict = [_video_to_dict(vi) for vi in filtered_video_list]
     aligned_json_dump(vi_dict, "output/json/comment_info.json")
     safe_print(f"\nバックアップJSONも作成: output/json/comment_info.json")
 
@@ -973,16 +1055,18 @@ def main():
     safe_print("\nコメントを取得中...")
     filter_singing_only = False  # すべての動画を対象とする
     secondary_filtered_list = []
-    for i, video_info in enumerate(filtered_video_list):
+    with ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS) as executor:
+        comment_lists = list(executor.map(get_comments, [vi.id for vi in filtered_video_list]))
+    for i, (video_info, comments) in enumerate(zip(filtered_video_list, comment_lists)):
         try:
             safe_print(f"{i+1}/{len(filtered_video_list)}: {video_info.title}")
         except UnicodeEncodeError:
             safe_print(f"{i+1}/{len(filtered_video_list)}: [title with emoji]")
-        video_info.comments = get_comments(video_info.id)
+        video_info.comments = comments
 
         if filter_singing_only:
             # 歌枠フィルタリング：コメント分析で再判定
-            comment_texts = [c.text_display for c in video_info.comments] if video_info.comments else []
+            comment_texts = (c.text_display for c in video_info.comments or ())
             if is_singing_stream(video_info.title, video_info.description, comment_texts):
                 secondary_filtered_list.append(video_info)
             else:
@@ -1011,29 +1095,17 @@ def main():
 
     # 5. CSV形式に変換（重複除去強化版）
     safe_print("\nCSV形式に変換中...")
-    rows = []
-    seen = {}
-    duplicate_groups = {}  # 重複をグループ化
-    idx = 1
+    best_by_key = {}  # 重複グループごとに最適な1件だけ保持
+    video_by_id = _index_videos_by_id(filtered_video_list)
+    confidence_by_id: dict[str, float] = {}
 
-    # 第1パス: すべてのタイムスタンプをグループ化
+    # 第1パス: タイムスタンプをグループ化し、グループごとに最適なものを残す
     for entry in all_timestamps:
         video_id = entry.video_id
         raw_title = entry.text
         timestamp = entry.timestamp
         published_at = getattr(entry, 'stream_start', None) or entry.published_at
 
-        # 確度スコア計算（該当する動画を見つけて計算）
-        confidence = 0.0
-        video_channel_id = None
-        for vi in filtered_video_list:
-            if vi.id == video_id:
-                # 改善版：動画のタイムスタンプを渡す
-                ts_for_video = video_timestamps_map.get(video_id, [])
-                confidence = analyzer.calculate_confidence_score(vi, ts_for_video)
-                video_channel_id = vi.channel_id  # チャンネルIDを取得
-                break
-
         song_title, artist = analyzer.parse_song_title_artist(raw_title)
 
         # 無効なエントリは除外（歌手なし、ナンバリングのみ、など）
@@ -1041,15 +1113,7 @@ def main():
             continue
 
         # タイムスタンプを秒に変換（±5秒以内は同じとみなす）
-        time_parts = timestamp.split(':')
-        total_seconds = 0
-        try:
-            if len(time_parts) == 2:  # mm:ss
-                total_seconds = int(time_parts[0]) * 60 + int(time_parts[1])
-            elif len(time_parts) == 3:  # hh:mm:ss
-                total_seconds = int(time_parts[0]) * 3600 + int(time_parts[1]) * 60 + int(time_parts[2])
-        except:
-            total_seconds = 0
+        total_seconds = _timestamp_to_seconds(timestamp)
 
         # 正規化キー（曲名とアーティストの類似性、タイムスタンプの近さで判定）
         normalized_key = (
@@ -1059,33 +1123,44 @@ def main():
             total_seconds // 5  # 5秒単位で丸める
         )
 
-        if normalized_key not in duplicate_groups:
-            duplicate_groups[normalized_key] = []
-
-        duplicate_groups[normalized_key].append({
-            'raw_title': raw_title,
-            'song_title': song_title,
-            'artist': artist,
-            'timestamp': timestamp,
-            'total_seconds': total_seconds,
-            'video_id': video_id,
-            'published_at': published_at,
-            'confidence': confidence,
-            'has_numbering': bool(re.match(r"^\s*\d+", raw_title))
-        })
+        # 優先順位: ナンバリングなし > 詳細な曲名 > 長い曲名（同点なら先に出たものを残す）
+        rank = (
+            not _LEADING_NUMBER_RE.match(raw_title),
+            len(song_title),
+            len(artist)
+        )
+        current = best_by_key.get(normalized_key)
+        if current is None or rank > current['rank']:
+            # 確度スコア計算（残す行がある動画だけ、動画ごとに一度だけ計算）
+            vi = video_by_id.get(video_id)
+            confidence = confidence_by_id.get(video_id)
+            if confidence is None:
+                # 改善版：動画のタイムスタンプを渡す
+                confidence = analyzer.calculate_confidence_score(vi, video_timestamps_map.get(video_id, [])) if vi else 0.0
+                confidence_by_id[video_id] = confidence
+            best_by_key[normalized_key] = {
+                'rank': rank,
+                'song_title': song_title,
+                'artist': artist,
+                'timestamp': timestamp,
+                'total_seconds': total_seconds,
+                'video_id': video_id,
+                'published_at': published_at,
+                'confidence': confidence
+            }
 
     # 音楽分類器を初期化
     music_classifier = MusicClassifier(request_delay=3.0)
 
+    date_str_by_published: dict[str, str] = {}
+
+    # (タイムスタンプ秒, 行) の組で保持し、ソート後に行だけを取り出す
+    singing_entries = []
+    other_entries = []
+
     safe_print("\n[*] タイムスタンプを分類中...")
-    # 第2パス: 各グループから最適なものを選択し、分類
-    for normalized_key, duplicates in duplicate_groups.items():
-        # 優先順位: ナンバリングなし > 詳細な曲名 > 長い曲名
-        best = max(duplicates, key=lambda x: (
-            not x['has_numbering'],  # ナンバリングがない方が優先
-            len(x['song_title']),     # 曲名が長い方が詳細
-            len(x['artist'])          # アーティスト名が長い方が詳細
-        ))
+    # 第2パス: 各グループで残った最適なものを分類
+    for best in best_by_key.values():
 
         # 音楽かどうかを判定し、必要に応じてアーティスト情報を補完
         classification = music_classifier.classify_timestamp(
@@ -1100,15 +1175,19 @@ def main():
         # ひらがな変換
         search_text = analyzer.to_hiragana(classification['title'])
 
-        # 日付をJSTへ
-        try:
-            dt = datetime.fromisoformat((best['published_at'] or "").replace("Z", "+00:00"))
-            date_str = dt.astimezone(timezone(timedelta(hours=9))).strftime("%Y/%m/%d")
-        except Exception:
-            date_str = ""
-
-        rows.append([
-            idx,
+        # 日付をJSTへ（同じ動画の行は同じ日時なので一度だけ変換）
+        published_at = best['published_at']
+        date_str = date_str_by_published.get(published_at)
+        if date_str is None:
+            try:
+                dt = datetime.fromisoformat((published_at or "").replace("Z", "+00:00"))
+                date_str = dt.astimezone(JST).strftime("%Y/%m/%d")
+            except Exception:
+                date_str = ""
+            date_str_by_published[published_at] = date_str
+
+        row = [
+            0,  # 連番はソート後に振る
             classification['title'],
             classification['artist'],
             search_text,
@@ -1116,35 +1195,22 @@ def main():
             best['timestamp'],
             date_str,
             best['video_id'],
-            f"{best['confidence']:.2f}",
-            best['total_seconds'],  # ソート用に追加（CSV出力時には除外）
-            classification['is_music']  # 音楽かどうかのフラグを追加
-        ])
-        idx += 1
-
-    # 配信日とタイムスタンプでソート（古い順）
-    rows.sort(key=lambda x: (x[6], x[9]))  # 配信日、タイムスタンプ（秒）でソート
+            f"{best['confidence']:.2f}"
+        ]
+        # 歌とその他に分類
+        if classification['is_music']:
+            singing_entries.append((best['total_seconds'], row))
+        else:
+            other_entries.append((best['total_seconds'], row))
 
-    # 歌とその他に分類
+    # 配信日とタイムスタンプ（秒）でファイルごとにソートし、連番を振る（古い順）
     singing_rows = []
     other_rows = []
-
-    for i, row in enumerate(rows, 1):
-        row[0] = i
-        is_music = row.pop()  # is_musicフラグを取り出す
-        total_seconds = row.pop()  # total_secondsを削除
-        # channel_idはそのまま残す（row[8]）
-
-        if is_music:
-            singing_rows.append(row)
-        else:
-            other_rows.append(row)
-
-    # 再度連番を振り直す
-    for i, row in enumerate(singing_rows, 1):
-        row[0] = i
-    for i, row in enumerate(other_rows, 1):
-        row[0] = i
+    for entries, output_rows in ((singing_entries, singing_rows), (other_entries, other_rows)):
+        entries.sort(key=lambda x: (x[1][6], x[0]))
+        for i, (_, row) in enumerate(entries, 1):
+            row[0] = i
+            output_rows.append(row)
 
     # 6. CSV出力（2つのファイル）
     output_dir = "output/csv"
@@ -1153,17 +1219,17 @@ def main():
     output_singing = os.path.join(output_dir, "song_timestamps_singing_only.csv")
     output_other = os.path.join(output_dir, "song_timestamps_other.csv")
 
-    with open(output_singing, "w", encoding="utf-8-sig", newline="") as f:
+    with open(output_singing, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア","チャンネルID"])
         writer.writerows(singing_rows)
 
-    with open(output_other, "w", encoding="utf-8-sig", newline="") as f:
+    with open(output_other, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["No","曲","歌手-ユニット","検索用","ジャンル","タイムスタンプ","配信日","動画ID","確度スコア","チャンネルID"])
         writer.writerows(other_rows)
 
-    rows = singing_rows + other_rows  # 統計表示用に結合
+    total_rows = len(singing_rows) + len(other_rows)
 
     safe_print(f"\n完了！CSVを出力しました:")
     safe_print(f"   - 歌枠: {output_singing} ({len(singing_rows)}件)")
@@ -1171,33 +1237,37 @@ def main():
     safe_print(f"\n統計:")
     safe_print(f"   - 処理した動画数: {len(filtered_video_list)}")
     safe_print(f"   - 抽出したタイムスタンプ数: {len(all_timestamps)}")
-    safe_print(f"   - 最終出力行数: {len(rows)}")
+    safe_print(f"   - 最終出力行数: {total_rows}")
 
-    if rows:
-        # 確度スコア統計
-        scores = [float(row[8]) for row in rows]
-        high_conf = len([s for s in scores if s > 0.7])
-        med_conf = len([s for s in scores if 0.4 <= s <= 0.7])
-        low_conf = len([s for s in scores if s < 0.4])
-
-        safe_print(f"\n   確度スコア分布:")
-        safe_print(f"   - 高確度 (>0.7): {high_conf}件 ({high_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 中確度 (0.4-0.7): {med_conf}件 ({med_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 低確度 (<0.4): {low_conf}件 ({low_conf/len(rows)*100:.1f}%)")
-        safe_print(f"   - 平均確度: {sum(scores)/len(scores):.2f}")
-
-        # ジャンル別統計
+    if total_rows:
+        # 確度スコア・ジャンル別統計を1回の走査で集計（2ファイル分の行を結合しない）
+        high_conf = med_conf = low_conf = 0
+        score_total = 0.0
         genre_stats = {}
-        for row in rows:
+        for row in chain(singing_rows, other_rows):
+            s = float(row[8])
+            score_total += s
+            if s > 0.7:
+                high_conf += 1
+            elif s >= 0.4:
+                med_conf += 1
+            else:
+                low_conf += 1
             genre = row[4]  # ジャンル列
             genre_stats[genre] = genre_stats.get(genre, 0) + 1
 
+        safe_print(f"\n   確度スコア分布:")
+        safe_print(f"   - 高確度 (>0.7): {high_conf}件 ({high_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 中確度 (0.4-0.7): {med_conf}件 ({med_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 低確度 (<0.4): {low_conf}件 ({low_conf/total_rows*100:.1f}%)")
+        safe_print(f"   - 平均確度: {score_total/total_rows:.2f}")
+
         safe_print(f"\n   ジャンル別統計:")
         for genre, count in sorted(genre_stats.items(), key=lambda x: x[1], reverse=True):
-            safe_print(f"   - {genre}: {count}曲 ({count/len(rows)*100:.1f}%)")
+            safe_print(f"   - {genre}: {count}曲 ({count/total_rows*100:.1f}%)")
 
     # JSONファイルも保存（バックアップ用）
-    vi_dict = [asdict(vi) for vi in filtered_video_list]
+    vi_dict = [_video_to_dict(vi) for vi in filtered_video_list]
     aligned_json_dump(vi_dict, "output/json/comment_info.json")
     safe_print(f"\nバックアップJSONも作成: output/json/comment_info.json")
 
@@ -0,0 +1,73 @@
+# api_cache.py
+# -*- coding: utf-8 -*-
+"""
+YouTube APIレスポンスのディスクキャッシュ
+
+同じ動画を何度も取得するとクォータと時間を消費するため、
+レスポンスを output/api_cache/<namespace>/<keyのハッシュ>.json に保存して再利用する。
+ファイルの更新日時が TTL を過ぎていれば期限切れとして再取得させる。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join("output", "api_cache")
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7日
+
+# 同一プロセス内での再読み込みを避けるためのメモリキャッシュ（値と保存時刻の組）
+# 長時間動くプロセスでも TTL を守れるよう、読み出し時にファイルと同じ基準で期限を判定する
+_memory_cache: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+
+
+def _cache_path(namespace: str, key: str, cache_dir: str) -> str:
+    # 記号を置き換えると別のキーが同じファイル名になりうるため、キーのハッシュをファイル名にする
+    # （大文字小文字を区別しないファイルシステムでも動画IDが衝突しない）
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, namespace, f"{digest}.json")
+
+
+def load_cache(namespace: str, key: str, ttl: float = DEFAULT_TTL, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[Any]:
+    """キャッシュを読み込む（存在しない・期限切れの場合はNone）"""
+    memo_key = (cache_dir, namespace, key)
+    memo = _memory_cache.get(memo_key)
+    if memo is not None:
+        saved_at, value = memo
+        if time.time() - saved_at <= ttl:
+            return value
+        _memory_cache.pop(memo_key, None)
+
+    path = _cache_path(namespace, key, cache_dir)
+    try:
+        saved_at = os.path.getmtime(path)
+        if time.time() - saved_at > ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    _memory_cache[memo_key] = (saved_at, value)
+    return value
+
+
+def save_cache(namespace: str, key: str, value: Any, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+    """キャッシュを保存（失敗しても処理は継続）"""
+    _memory_cache[(cache_dir, namespace, key)] = (time.time(), value)
+
+    path = _cache_path(namespace, key, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"警告: APIキャッシュ保存エラー: {e}")
+
+
+__all__ = ["DEFAULT_CACHE_DIR", "DEFAULT_TTL", "load_cache", "save_cache"]
@@ -5,7 +5,16 @@
 
 import json
 import os
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Pattern
+
+def _compile_keywords(keywords) -> Optional[Pattern]:
+    """キーワードのいずれかを含むか1回の検索で判定する正規表現（キーワードがなければNone）"""
+    keywords = [keyword.lower() for keyword in keywords]
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
 
 class GenreClassifier:
     """ジャンル分類クラス"""
@@ -28,6 +37,20 @@ class GenreClassifier:
             self.genres = self.config.get("genres", {})
             # 逆引き用（アーティスト → ジャンル）
             self.artist_to_genre = self._build_artist_to_genre_map()
+            # キーワード判定を行うジャンルの優先度順（分類のたびにソートしないよう初期化時に一度だけ作る）
+            self.genre_priority = [
+                genre_name for genre_name, _ in sorted(
+                    self.genres.items(),
+                    key=lambda x: x[1].get('priority', 99)
+                )
+                if genre_name in self.keyword_patterns
+            ]
+            # キーワードは小文字化して1つの正規表現にまとめておく（分類のたびにlower()・ループしない）
+            self.keyword_pattern_res = {
+                genre_name: _compile_keywords(self.keyword_patterns[genre_name])
+                for genre_name in self.genre_priority
+            }
+            self.category_keyword_res = {}
         else:
             # 旧フォーマット (genre_keywords.json)
             self.categories = self.config.get("categories", {})
@@ -35,6 +58,20 @@ class GenreClassifier:
             self.artist_mappings_by_genre = {}
             self.keyword_patterns = {}
             self.genres = {}
+            self.genre_priority = []
+            self.keyword_pattern_res = {}
+            # カテゴリごとの全キーワード（小文字化して1つの正規表現にまとめる）
+            self.category_keyword_res = {
+                category: _compile_keywords(
+                    keyword
+                    for field_values in category_data.values() if isinstance(field_values, list)
+                    for keyword in field_values
+                )
+                for category, category_data in self.categories.items()
+            }
+
+        # アーティスト名の部分一致結果（アーティストごとに一度だけ走査する）
+        self._partial_match_cache: Dict[str, Optional[str]] = {}
 
         # 後方互換性のため
         self.artist_mapping = self.artist_to_genre
@@ -99,23 +136,15 @@ class GenreClassifier:
         search_text = f"{artist} {song_title}".lower()
 
         # ジャンルを優先度順にチェック
-        genre_priority = sorted(
-            self.genres.items(),
-            key=lambda x: x[1].get('priority', 99)
-        )
-
-        for genre_name, _ in genre_priority:
-            if genre_name in self.keyword_patterns:
-                keywords = self.keyword_patterns[genre_name]
-                for keyword in keywords:
-                    if keyword.lower() in search_text:
-                        return genre_name
+        for genre_name in self.genre_priority:
+            pattern_re = self.keyword_pattern_res[genre_name]
+            if pattern_re is not None and pattern_re.search(search_text):
+                return genre_name
 
         # 優先度3: 部分一致チェック
-        for genre, artists in self.artist_mappings_by_genre.items():
-            for mapped_artist in artists:
-                if mapped_artist in artist or artist in mapped_artist:
-                    return genre
+        genre = self._match_partial_artist(artist)
+        if genre is not None:
+            return genre
 
         # アーティスト情報がある場合は「その他」
         if artist and artist.strip() and artist.lower() not in ['nan', '-', 'none', '']:
@@ -123,6 +152,20 @@ class GenreClassifier:
 
         return "その他"
 
+    def _match_partial_artist(self, artist: str) -> Optional[str]:
+        """登録アーティストと部分一致するジャンルを返す（なければNone）"""
+        if artist in self._partial_match_cache:
+            return self._partial_match_cache[artist]
+
+        match = None
+        for genre, artists in self.artist_mappings_by_genre.items():
+            if any(mapped_artist in artist or artist in mapped_artist for mapped_artist in artists):
+                match = genre
+                break
+
+        self._partial_match_cache[artist] = match
+        return match
+
     def _classify_legacy(self, artist: str, song_title: str = "") -> str:
         """旧フォーマットでの分類（後方互換性）"""
         # 優先度1: アーティスト名の完全一致
@@ -162,21 +205,9 @@ class GenreClassifier:
         Returns:
             マッチしたかどうか
         """
-        if category not in self.categories:
-            return False
-
-        category_data = self.categories[category]
-
-        # すべてのフィールドをチェック
-        for field_name, field_values in category_data.items():
-            if not isinstance(field_values, list):
-                continue
-
-            for keyword in field_values:
-                if keyword.lower() in search_text:
-                    return True
-
-        return False
+        # すべてのフィールドのキーワードをチェック
+        pattern_re = self.category_keyword_res.get(category)
+        return pattern_re is not None and pattern_re.search(search_text) is not None
 
     def get_all_keywords(self, category: str) -> List[str]:
         """
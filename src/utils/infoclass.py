@@ -4,10 +4,93 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
 
+# タイムスタンプ抽出用の正規表現（呼び出しごとに組み立てず、読み込み時に一度だけコンパイル）
+
+# 全パターン共通の「分:秒」部分。これが無いテキストは抽出をスキップできる
+_ANY_TIMESTAMP_RE = re.compile(r'\d{1,2}:\d{2}')
+
+_NUMBERING_RE = re.compile(r"""
+    ^\s*
+    (?:
+        [\(\[\uFF08]?\s*\d+\s*[\)\]\uFF09]?
+        [\.\uFF0E\u3002:\uFF1A\)\]-]*
+        |
+        \d+[\.\uFF0E\u3002:\uFF1A\)\]-]*
+    )
+    \s*
+""", re.VERBOSE)
+
+# HTMLリンク形式
+# パターン1: 標準形式
+# <a href="...">6:53</a> 1.サイハテ/小林オニキス feat. 初音ミク
+# パターン2: 数字が混在する形式
+# 00:09 14</a> 01. 空も飛べるはず / スピッツ
+# パターン3: より柔軟な形式
+# <a ...>01:23</a> - 曲名 / アーティスト
+_HTML_ANCHOR_PATTERNS = [
+    re.compile(r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*(.+?)(?=<br|<a |$)', re.MULTILINE | re.DOTALL),
+    re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)\s*\d*</a>\s*(.+?)(?=<br|<a |$)', re.MULTILINE | re.DOTALL),
+    re.compile(r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*[-–—:：・･]?\s*(.+?)(?=<br|<a |$)', re.MULTILINE | re.DOTALL),
+]
+# パターン4: 分と秒が分離されている特殊形式
+# 00:04 48</a> 01. マリーゴールド / あいみょん
+# 00:42 52</a> 09. 晴る / ヨルシカ
+_HTML_SPLIT_SECONDS_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\s+(\d{2})</a>\s*(.+?)(?=<br|<a |$)', re.MULTILINE | re.DOTALL)
+
+# プレーンテキスト形式
+_PLAIN_LINE_PATTERNS = [
+    # パターン1: 標準形式（スペース区切り）
+    # 6:53 1.サイハテ/小林オニキス feat. 初音ミク
+    re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)\s+(.+?)(?=\n|\d{1,2}:\d{2}|$)', re.MULTILINE | re.DOTALL),
+
+    # パターン2: 様々な区切り文字
+    # 00:04:48 - マリーゴールド / あいみょん
+    # 01:23:45 ： 曲名 / アーティスト（全角コロンのみ）
+    # 02:34・曲名 / アーティスト
+    # 注意: 半角コロン「:」は削除（タイムスタンプの秒部分と誤認識するため）
+    re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–—：・･/／]\s*(.+?)(?=\n|\d{1,2}:\d{2}|$)', re.MULTILINE | re.DOTALL),
+
+    # パターン3: 括弧区切り
+    # 1:23) 曲名 / アーティスト
+    # (01:23) 曲名 / アーティスト
+    re.compile(r'[\(\(]?(\d{1,2}:\d{2}(?::\d{2})?)\s*[\)\)]\s*(.+?)(?=\n|\d{1,2}:\d{2}|$)', re.MULTILINE | re.DOTALL),
+
+    # パターン4: 改行なしの連続形式
+    # 00:42:52 09. 晴る / ヨルシカ
+    re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)\s*\d*\.\s*(.+?)(?=\s+\d{1,2}:\d{2}|$)', re.MULTILINE | re.DOTALL),
+]
+
+# 抽出した内容のクリーンアップ
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_PARTIAL_HTML_TAG_RE = re.compile(r'</?[a-zA-Z][^>]*')
+_ANGLE_BRACKET_RE = re.compile(r'[<>]')
+_LEADING_NUMBER_RE = re.compile(r'^\s*\d+[\.\)）\]】\-ー・:：]\s*')
+_LEADING_BRACKET_NUMBER_RE = re.compile(r'^\s*[\(\(【\[]\s*\d+\s*[\)\)】\]]\s*')
+_LEADING_SEPARATOR_RE = re.compile(r'^[-–—:：・･/／\s]+')
+_TRAILING_BACKSLASH_RE = re.compile(r'[\\\s]+$')
+
+# 楽曲タイムスタンプとして無効なパターン（緩和版）
+# 前方一致・部分一致で済むものは小文字化した内容に対する文字列判定で行う
+_INVALID_SONG_PREFIXES = (
+    'http://', 'https://',      # URLで始まる
+    'www.',                     # www.で始まる
+    'UCY85ViSyTU5Wy_bwsUVjkdA'.lower(),  # チャンネルIDを含む
+)
+_INVALID_SONG_SUBSTRINGS = (
+    'youtube.com',              # YouTube URLを含む
+)
+_SYMBOLS_ONLY_RE = re.compile(r'^[\d\s\-\.、，。]+$')  # 数字と記号のみ
+_SONG_CHAR_RE = re.compile(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+_TIMESTAMP_TYPO_RE = re.compile(r'(\d{1,2}):(\d{3,}):(\d{2})')
+# 秒数変換用（mm:ss / hh:mm:ss）
+_TIMESTAMP_SECONDS_RE = re.compile(r'^(?:(\d+):)?(\d+):(\d+)$')
+
+
 @dataclass
 class CommentInfo:
     text_display: str
@@ -92,17 +175,7 @@ class TimeStamp:
         self.text = self.text.strip()
 
         # 先頭ナンバリングを削除
-        numbering_pattern = r"""
-            ^\s*
-            (?:
-                [\(\[\uFF08]?\s*\d+\s*[\)\]\uFF09]?
-                [\.\uFF0E\u3002:\uFF1A\)\]-]*
-                |
-                \d+[\.\uFF0E\u3002:\uFF1A\)\]-]*
-            )
-            \s*
-        """
-        self.text = re.sub(numbering_pattern, "", self.text, flags=re.VERBOSE)
+        self.text = _NUMBERING_RE.sub("", self.text)
         self.text = self.text.strip()
 
     @classmethod
@@ -110,29 +183,10 @@ class TimeStamp:
         # HTMLリンク形式のタイムスタンプを抽出（複数パターン対応）
         timestamp_list: List[TimeStamp] = []
 
-        # パターン1: 標準形式
-        # <a href="...">6:53</a> 1.サイハテ/小林オニキス feat. 初音ミク
-        pattern1 = r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*(.+?)(?=<br|<a |$)'
-
-        # パターン2: 数字が混在する形式
-        # 00:09 14</a> 01. 空も飛べるはず / スピッツ
-        pattern2 = r'(\d{1,2}:\d{2}(?::\d{2})?)\s*\d*</a>\s*(.+?)(?=<br|<a |$)'
-
-        # パターン3: より柔軟な形式
-        # <a ...>01:23</a> - 曲名 / アーティスト
-        pattern3 = r'<a[^>]*>(\d{1,2}:\d{2}(?::\d{2})?)</a>\s*[-–—:：・･]?\s*(.+?)(?=<br|<a |$)'
-
-        # パターン4: 分と秒が分離されている特殊形式 ★新規追加★
-        # 00:04 48</a> 01. マリーゴールド / あいみょん
-        # 00:42 52</a> 09. 晴る / ヨルシカ
-        pattern4 = r'(\d{1,2}):(\d{2})\s+(\d{2})</a>\s*(.+?)(?=<br|<a |$)'
-
-        all_patterns = [pattern1, pattern2, pattern3]
-
         seen = set()  # 重複防止
 
         # パターン4を先に処理（特殊形式）
-        matches4 = re.finditer(pattern4, text, re.MULTILINE | re.DOTALL)
+        matches4 = _HTML_SPLIT_SECONDS_PATTERN.finditer(text)
         for match in matches4:
             # 分:秒 秒 を 分:秒:秒 に再構築
             minutes = match.group(1)
@@ -142,24 +196,24 @@ class TimeStamp:
             content = match.group(4).strip()
 
             # HTMLタグを除去
-            content = re.sub(r'<[^>]+>', '', content)
+            content = _HTML_TAG_RE.sub('', content)
 
             # 不完全なHTMLタグも除去（開始タグのみ、終了タグのみ）
-            content = re.sub(r'</?[a-zA-Z][^>]*', '', content)
+            content = _PARTIAL_HTML_TAG_RE.sub('', content)
 
             # 単独の < > を除去
-            content = re.sub(r'[<>]', '', content)
+            content = _ANGLE_BRACKET_RE.sub('', content)
 
             # HTMLエスケープを元に戻す
             content = content.replace('&amp;', '&').replace('&#39;', "'").replace('&quot;', '"')
             content = content.replace('&lt;', '<').replace('&gt;', '>').replace('&nbsp;', ' ')
 
             # エスケープ復元後に残った < > も除去
-            content = re.sub(r'[<>]', '', content)
+            content = _ANGLE_BRACKET_RE.sub('', content)
 
             # 先頭のナンバリングを除去
-            content = re.sub(r'^\s*\d+[\.\)）\]】\-ー・:：]\s*', '', content)
-            content = re.sub(r'^\s*[\(\(【\[]\s*\d+\s*[\)\)】\]]\s*', '', content)
+            content = _LEADING_NUMBER_RE.sub('', content)
+            content = _LEADING_BRACKET_NUMBER_RE.sub('', content)
 
             content = content.strip()
 
@@ -183,34 +237,34 @@ class TimeStamp:
                 )
 
         # 他のパターンを処理
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        for pattern in _HTML_ANCHOR_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 timestamp = match.group(1)
                 content = match.group(2).strip()
 
                 # HTMLタグを除去
-                content = re.sub(r'<[^>]+>', '', content)
+                content = _HTML_TAG_RE.sub('', content)
 
                 # 不完全なHTMLタグも除去（開始タグのみ、終了タグのみ）
-                content = re.sub(r'</?[a-zA-Z][^>]*', '', content)
+                content = _PARTIAL_HTML_TAG_RE.sub('', content)
 
                 # 単独の < > を除去
-                content = re.sub(r'[<>]', '', content)
+                content = _ANGLE_BRACKET_RE.sub('', content)
 
                 # HTMLエスケープを元に戻す
                 content = content.replace('&amp;', '&').replace('&#39;', "'").replace('&quot;', '"')
                 content = content.replace('&lt;', '<').replace('&gt;', '>').replace('&nbsp;', ' ')
 
                 # エスケープ復元後に残った < > も除去
-                content = re.sub(r'[<>]', '', content)
+                content = _ANGLE_BRACKET_RE.sub('', content)
 
                 # 先頭のナンバリングを除去（より包括的）
-                content = re.sub(r'^\s*\d+[\.\)）\]】\-ー・:：]\s*', '', content)
-                content = re.sub(r'^\s*[\(\(【\[]\s*\d+\s*[\)\)】\]]\s*', '', content)
+                content = _LEADING_NUMBER_RE.sub('', content)
+                content = _LEADING_BRACKET_NUMBER_RE.sub('', content)
 
                 # 末尾の記号を除去（バックスラッシュ、スペース等）
-                content = re.sub(r'[\\\s]+$', '', content)
+                content = _TRAILING_BACKSLASH_RE.sub('', content)
                 content = content.strip()
 
                 # 重複チェック
@@ -241,53 +295,30 @@ class TimeStamp:
         # \r\nを\nに統一、\rも処理
         text = text.replace('\r\n', '\n').replace('\r', '\n')
 
-        # 複数のパターンで抽出（より包括的）
-        patterns = [
-            # パターン1: 標準形式（スペース区切り）
-            # 6:53 1.サイハテ/小林オニキス feat. 初音ミク
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s+(.+?)(?=\n|\d{1,2}:\d{2}|$)',
-
-            # パターン2: 様々な区切り文字
-            # 00:04:48 - マリーゴールド / あいみょん
-            # 01:23:45 ： 曲名 / アーティスト（全角コロンのみ）
-            # 02:34・曲名 / アーティスト
-            # 注意: 半角コロン「:」は削除（タイムスタンプの秒部分と誤認識するため）
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*[-–—：・･/／]\s*(.+?)(?=\n|\d{1,2}:\d{2}|$)',
-
-            # パターン3: 括弧区切り
-            # 1:23) 曲名 / アーティスト
-            # (01:23) 曲名 / アーティスト
-            r'[\(\(]?(\d{1,2}:\d{2}(?::\d{2})?)\s*[\)\)]\s*(.+?)(?=\n|\d{1,2}:\d{2}|$)',
-
-            # パターン4: 改行なしの連続形式
-            # 00:42:52 09. 晴る / ヨルシカ
-            r'(\d{1,2}:\d{2}(?::\d{2})?)\s*\d*\.\s*(.+?)(?=\s+\d{1,2}:\d{2}|$)',
-        ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        for pattern in _PLAIN_LINE_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 timestamp = match.group(1)
                 content = match.group(2).strip()
 
                 # HTMLタグを除去（念のため）
-                content = re.sub(r'<[^>]+>', '', content)
-                content = re.sub(r'</?[a-zA-Z][^>]*', '', content)
-                content = re.sub(r'[<>]', '', content)
+                content = _HTML_TAG_RE.sub('', content)
+                content = _PARTIAL_HTML_TAG_RE.sub('', content)
+                content = _ANGLE_BRACKET_RE.sub('', content)
 
                 # HTMLエスケープを元に戻す
                 content = content.replace('&amp;', '&').replace('&#39;', "'").replace('&quot;', '"')
                 content = content.replace('&lt;', '<').replace('&gt;', '>').replace('&nbsp;', ' ')
-                content = re.sub(r'[<>]', '', content)
+                content = _ANGLE_BRACKET_RE.sub('', content)
 
                 # ナンバリングを除去（より包括的）
-                content = re.sub(r'^\s*\d+[\.\)）\]】\-ー・:：]\s*', '', content)
-                content = re.sub(r'^\s*[\(\(【\[]\s*\d+\s*[\)\)】\]]\s*', '', content)
+                content = _LEADING_NUMBER_RE.sub('', content)
+                content = _LEADING_BRACKET_NUMBER_RE.sub('', content)
 
                 # 余分な記号を除去
-                content = re.sub(r'^[-–—:：・･/／\s]+', '', content)
+                content = _LEADING_SEPARATOR_RE.sub('', content)
                 # 末尾の記号を除去（バックスラッシュ、スペース等）
-                content = re.sub(r'[\\\s]+$', '', content)
+                content = _TRAILING_BACKSLASH_RE.sub('', content)
                 content = content.strip()
 
                 # 重複チェック
@@ -313,26 +344,21 @@ class TimeStamp:
     
     @classmethod
     def _is_valid_song_timestamp(cls, timestamp: str, content: str) -> bool:
-        # 明らかに無効なパターンを除外（緩和版）
-        invalid_patterns = [
-            r'^https?://',                    # URLで始まる
-            r'^www\.',                        # www.で始まる
-            r'^[\d\s\-\.、，。]+$',           # 数字と記号のみ
-            r'youtube\.com',                  # YouTube URLを含む
-            r'^UCY85ViSyTU5Wy_bwsUVjkdA',   # チャンネルIDを含む
-        ]
-
         # 特定のキーワードは除外（ただし楽曲っぽいものは許可）
         exclude_keywords = [
             '配信開始', 'くしゃみ', '待機画面', '待機中', '開演', '終演'
         ]
 
-        for pattern in invalid_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return False
+        # 明らかに無効なパターンを除外（緩和版）
+        content_lower = content.lower()
+        if content_lower.startswith(_INVALID_SONG_PREFIXES):
+            return False
+        if any(substring in content_lower for substring in _INVALID_SONG_SUBSTRINGS):
+            return False
+        if _SYMBOLS_ONLY_RE.search(content):
+            return False
 
         # 除外キーワードをチェック（部分一致）
-        content_lower = content.lower()
         for keyword in exclude_keywords:
             if keyword.lower() in content_lower and '/' not in content:
                 # スラッシュがない場合のみ除外（曲名/アーティスト形式は許可）
@@ -348,11 +374,20 @@ class TimeStamp:
             return True
 
         # 文字（日本語、英語）が含まれている
-        if re.search(r'[a-zA-Z\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', content):
+        if _SONG_CHAR_RE.search(content):
             return True
 
         return False
     
+    @classmethod
+    def to_seconds(cls, timestamp: str) -> int:
+        """タイムスタンプ（mm:ss / hh:mm:ss）を秒数に変換（解釈できない場合は0）"""
+        match = _TIMESTAMP_SECONDS_RE.match(timestamp)
+        if not match:
+            return 0
+        hours, minutes, seconds = match.groups()
+        return (int(hours) * 3600 if hours else 0) + int(minutes) * 60 + int(seconds)
+
     @classmethod
     def _is_clock_time(cls, timestamp: str) -> bool:
         parts = timestamp.split(':')
@@ -383,12 +418,16 @@ class TimeStamp:
 
             return f"{hours}:{minutes}:{seconds}"
 
-        text = re.sub(r'(\d{1,2}):(\d{3,}):(\d{2})', fix_minutes, text)
+        text = _TIMESTAMP_TYPO_RE.sub(fix_minutes, text)
 
         return text
 
     @classmethod
     def from_text(cls, video_id: str, video_title: str, published_at: str, text: str, stream_start: str = None) -> List["TimeStamp"]:
+        # タイムスタンプを含まないテキスト（大半のコメント）は全パターンの走査を省略
+        if not text or not _ANY_TIMESTAMP_RE.search(text):
+            return []
+
         # タイムスタンプの誤植を修正
         text = cls._fix_timestamp_typos(text)
 
@@ -402,7 +441,8 @@ class TimeStamp:
 
         # 重複除去（HTML形式とプレーンテキスト形式の両方から取得した場合）
         # 同じ曲名・動画IDでも時間が大きく離れている場合は別エントリとして保持
-        seen = {}
+        # 曲名ごとに採用済みの秒数をソート済みリストで持ち、二分探索で近傍だけを確認する
+        seen_seconds: Dict[str, List[int]] = {}
         deduplicated = []
 
         for ts in out:
@@ -410,44 +450,19 @@ class TimeStamp:
             normalized_text = ts.text.lower().strip()
 
             # タイムスタンプを秒に変換
-            parts = ts.timestamp.split(':')
-            total_seconds = 0
-            try:
-                if len(parts) == 2:  # mm:ss
-                    total_seconds = int(parts[0]) * 60 + int(parts[1])
-                elif len(parts) == 3:  # hh:mm:ss
-                    total_seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-            except (ValueError, IndexError):
-                total_seconds = 0
-
-            # 同じ曲名・動画IDの既存エントリをチェック
-            key_base = (video_id, normalized_text)
+            total_seconds = cls.to_seconds(ts.timestamp)
 
             # 近い時間（30秒以内）のエントリが既に存在するかチェック
-            is_duplicate = False
-            for existing_key, existing_ts in seen.items():
-                if existing_key[0] == video_id and existing_key[1] == normalized_text:
-                    # 既存エントリとの時間差を計算
-                    existing_parts = existing_ts.timestamp.split(':')
-                    existing_seconds = 0
-                    try:
-                        if len(existing_parts) == 2:
-                            existing_seconds = int(existing_parts[0]) * 60 + int(existing_parts[1])
-                        elif len(existing_parts) == 3:
-                            existing_seconds = int(existing_parts[0]) * 3600 + int(existing_parts[1]) * 60 + int(existing_parts[2])
-                    except (ValueError, IndexError):
-                        existing_seconds = 0
-
-                    # 30秒以内なら重複とみなす
-                    time_diff = abs(total_seconds - existing_seconds)
-                    if time_diff <= 30:
-                        is_duplicate = True
-                        break
+            # 挿入位置の前後どちらかが最も近い既存エントリになる
+            kept = seen_seconds.setdefault(normalized_text, [])
+            index = bisect_left(kept, total_seconds)
+            is_duplicate = (
+                (index < len(kept) and kept[index] - total_seconds <= 30)
+                or (index > 0 and total_seconds - kept[index - 1] <= 30)
+            )
 
             if not is_duplicate:
-                # ユニークなキーを作成（曲名 + 秒数の範囲）
-                unique_key = (video_id, normalized_text, total_seconds // 60)  # 1分単位で区別
-                seen[unique_key] = ts
+                kept.insert(index, total_seconds)
                 deduplicated.append(ts)
 
         return deduplicated
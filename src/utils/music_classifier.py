@@ -55,6 +55,12 @@ class MusicClassifier:
         r'^枚目',
     ]
 
+    # キーワード（部分一致）とパターンを1つの正規表現にまとめ、タイトルを1回の走査で判定する
+    NON_MUSIC_RE = re.compile('|'.join(
+        list(map(re.escape, NON_MUSIC_KEYWORDS))
+        + [f'(?:{pattern})' for pattern in NON_MUSIC_PATTERNS]
+    ))
+
     def __init__(self, request_delay: float = 3.0):
         """
         Args:
@@ -67,15 +73,9 @@ class MusicClassifier:
         """タイトルに歌以外のキーワードが含まれるかチェック"""
         title_lower = title.lower()
 
-        # キーワードチェック
-        for keyword in self.NON_MUSIC_KEYWORDS:
-            if keyword in title_lower:
-                return True
-
-        # パターンチェック（正規表現）
-        for pattern in self.NON_MUSIC_PATTERNS:
-            if re.search(pattern, title_lower):
-                return True
+        # キーワード・パターンチェック（まとめて1回で判定）
+        if self.NON_MUSIC_RE.search(title_lower):
+            return True
 
         # 短すぎるタイトル（3文字以下）は除外
         if len(title.strip()) <= 3:
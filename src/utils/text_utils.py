@@ -0,0 +1,63 @@
+# text_utils.py
+# -*- coding: utf-8 -*-
+"""
+歌スクレイパー共通のテキスト処理
+
+曲名のひらがな変換（MeCabがあれば読み仮名、なければ簡易変換）と、
+タイムスタンプ数の判定を各スクレイパーで共有する。
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# MeCabのインポート（オプション）
+try:
+    import MeCab
+    mecab_reading = MeCab.Tagger('-Oyomi')
+    print("MeCab loaded successfully")
+except (ImportError, RuntimeError) as e:
+    print(f"MeCab not available: {type(e).__name__}. Using simple hiragana conversion.")
+    mecab_reading = None
+
+# カタカナ(ァ〜ヶ)→ひらがなの変換テーブル
+KATAKANA_TO_HIRAGANA = {cp: cp - ord('ァ') + ord('ぁ') for cp in range(ord('ァ'), ord('ヶ') + 1)}
+
+# 簡易変換用: カタカナ→ひらがな、英大文字→小文字、全角数字→半角、全角括弧は除去
+SIMPLE_HIRAGANA_TABLE = {
+    **KATAKANA_TO_HIRAGANA,
+    **{cp: cp + 32 for cp in range(ord('A'), ord('Z') + 1)},
+    **{ord('０') + i: ord('0') + i for i in range(10)},
+    **{ord(c): None for c in '（）［］｛｝'},
+}
+
+_TIMESTAMP_RE = re.compile(r'\d{1,2}:\d{2}')
+
+
+# 同じ曲名は複数の配信に現れるため、MeCab変換は曲名単位でキャッシュする
+@lru_cache(maxsize=8192)
+def to_hiragana(text: str) -> str:
+    """テキストをひらがなに変換"""
+    if mecab_reading:
+        try:
+            reading = mecab_reading.parse(text).strip()
+            return reading.translate(KATAKANA_TO_HIRAGANA).lower()
+        except:
+            pass
+
+    # MeCabが使えない場合の簡易変換
+    return text.lower().translate(SIMPLE_HIRAGANA_TABLE)
+
+
+def has_min_timestamps(text: str, minimum: int) -> bool:
+    """タイムスタンプがminimum個以上あるか（見つかった時点で打ち切る）"""
+    count = 0
+    for _ in _TIMESTAMP_RE.finditer(text):
+        count += 1
+        if count >= minimum:
+            return True
+    return False
+
+
+__all__ = ["KATAKANA_TO_HIRAGANA", "SIMPLE_HIRAGANA_TABLE", "to_hiragana", "has_min_timestamps"]
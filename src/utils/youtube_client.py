@@ -0,0 +1,40 @@
+# youtube_client.py
+# -*- coding: utf-8 -*-
+"""
+YouTube APIクライアントのスレッドごとの使い分け
+
+googleapiclient のHTTPオブジェクト（httplib2）はスレッドセーフではないため、
+並列取得ではワーカースレッドごとにクライアントを生成して使い回す。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+
+class ThreadLocalClient:
+    """メインスレッドでは既存のクライアントを、ワーカースレッドではスレッドごとのクライアントを返す"""
+
+    def __init__(self, main_client: Any, build: Callable[[], Any]):
+        """
+        Args:
+            main_client: メインスレッドで使うクライアント
+            build: ワーカースレッド用のクライアントを生成する関数
+        """
+        self._main_client = main_client
+        self._build = build
+        self._local = threading.local()
+
+    def get(self) -> Any:
+        """現在のスレッド用のYouTube APIクライアントを取得"""
+        if threading.current_thread() is threading.main_thread():
+            return self._main_client
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._build()
+            self._local.client = client
+        return client
+
+
+__all__ = ["ThreadLocalClient"]
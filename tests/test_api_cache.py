@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import api_cache
+from utils.api_cache import load_cache, save_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    api_cache._memory_cache.clear()
+    yield
+    api_cache._memory_cache.clear()
+
+
+def test_round_trip(tmp_path):
+    value = {"items": [{"id": "abc", "title": "歌枠"}]}
+    save_cache("videos", "abc", value, cache_dir=str(tmp_path))
+    assert load_cache("videos", "abc", cache_dir=str(tmp_path)) == value
+
+    # メモリキャッシュを消してもファイルから読める
+    api_cache._memory_cache.clear()
+    assert load_cache("videos", "abc", cache_dir=str(tmp_path)) == value
+
+
+def test_missing_key_returns_none(tmp_path):
+    assert load_cache("videos", "missing", cache_dir=str(tmp_path)) is None
+
+
+def test_similar_keys_do_not_collide(tmp_path):
+    save_cache("comments", "a.b", 1, cache_dir=str(tmp_path))
+    save_cache("comments", "a_b", 2, cache_dir=str(tmp_path))
+    save_cache("comments", "A_b", 3, cache_dir=str(tmp_path))
+    api_cache._memory_cache.clear()
+
+    assert load_cache("comments", "a.b", cache_dir=str(tmp_path)) == 1
+    assert load_cache("comments", "a_b", cache_dir=str(tmp_path)) == 2
+    assert load_cache("comments", "A_b", cache_dir=str(tmp_path)) == 3
+
+
+def test_expired_file_is_ignored(tmp_path):
+    save_cache("videos", "old", [1, 2], cache_dir=str(tmp_path))
+    api_cache._memory_cache.clear()
+
+    path = api_cache._cache_path("videos", "old", str(tmp_path))
+    past = time.time() - 120
+    os.utime(path, (past, past))
+
+    assert load_cache("videos", "old", ttl=60, cache_dir=str(tmp_path)) is None
+    assert load_cache("videos", "old", ttl=600, cache_dir=str(tmp_path)) == [1, 2]
+
+
+def test_expired_memory_entry_is_ignored(tmp_path, monkeypatch):
+    save_cache("videos", "memo", "value", cache_dir=str(tmp_path))
+    path = api_cache._cache_path("videos", "memo", str(tmp_path))
+    past = time.time() - 120
+    os.utime(path, (past, past))
+
+    # 保存から時間が経った長時間プロセスを再現する
+    now = time.time()
+    monkeypatch.setattr(api_cache.time, "time", lambda: now + 120)
+    assert load_cache("videos", "memo", ttl=60, cache_dir=str(tmp_path)) is None
+
+
+def test_corrupt_file_returns_none(tmp_path):
+    path = api_cache._cache_path("videos", "broken", str(tmp_path))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert load_cache("videos", "broken", cache_dir=str(tmp_path)) is None
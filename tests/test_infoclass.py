@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.infoclass import TimeStamp
+
+
+@pytest.mark.parametrize("timestamp, expected", [
+    ("0:00", 0),
+    ("3:25", 205),
+    ("12:05", 725),
+    ("1:02:03", 3723),
+    ("10:00:00", 36000),
+])
+def test_to_seconds(timestamp, expected):
+    assert TimeStamp.to_seconds(timestamp) == expected
+
+
+@pytest.mark.parametrize("timestamp", ["", "abc", "1:2:3:4", "12"])
+def test_to_seconds_invalid_returns_zero(timestamp):
+    assert TimeStamp.to_seconds(timestamp) == 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import importlib
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+SHARED_VIDEO_ID = "shared00001"
+DESCRIPTION = "0:10 夜に駆ける / YOASOBI\n3:20 マリーゴールド / あいみょん\n7:45 晴る / ヨルシカ"
+
+
+@pytest.fixture
+def song_scraper(tmp_path, monkeypatch):
+    """APIに接続しない状態で youtube_song_scraper を読み込む"""
+    pytest.importorskip("googleapiclient")
+    pytest.importorskip("dotenv")
+    monkeypatch.setenv("API_KEY", "test-key")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "user_ids.json").write_text("[]", encoding="utf-8")
+    (tmp_path / "output" / "json").mkdir(parents=True)
+    monkeypatch.syspath_prepend(SRC_DIR)
+    sys.modules.pop("extractors.youtube_song_scraper", None)
+    return importlib.import_module("extractors.youtube_song_scraper")
+
+
+def test_shared_video_uses_first_listed_channel(song_scraper, tmp_path, monkeypatch):
+    """複数チャンネルの一覧に載る動画は最初のチャンネル、それ以外は自分のチャンネルのIDで出力する"""
+    from utils.infoclass import VideoInfo
+
+    videos_by_channel = {
+        "UCaaa": [SHARED_VIDEO_ID, "only_a_0001"],
+        "UCbbb": [SHARED_VIDEO_ID, "only_b_0001"],
+    }
+
+    def fake_video_list(playlist_id, published_after=None, channel_id=None, filter_fn=None):
+        videos = []
+        for i, video_id in enumerate(videos_by_channel[channel_id]):
+            vi = VideoInfo(
+                id=video_id,
+                title=f"【歌枠】{video_id}",
+                description=DESCRIPTION,
+                published_at=f"2024-01-0{i + 1}T12:00:00Z",
+                comments=[],
+            )
+            vi.channel_id = channel_id
+            if filter_fn is None or filter_fn(vi):
+                videos.append(vi)
+        return videos
+
+    class FakeMusicClassifier:
+        def __init__(self, **kwargs):
+            pass
+
+        def classify_timestamp(self, title, artist, use_itunes=False):
+            return {'title': title, 'artist': artist, 'is_music': True}
+
+    monkeypatch.setattr(song_scraper, "get_uploads_playlist_id", lambda channel_id: "UU" + channel_id[2:])
+    monkeypatch.setattr(song_scraper, "get_video_info_in_playlist", fake_video_list)
+    monkeypatch.setattr(song_scraper, "get_comments", lambda video_id: [])
+    monkeypatch.setattr(song_scraper, "MusicClassifier", FakeMusicClassifier)
+
+    output_file = tmp_path / "output" / "csv" / "song_timestamps_complete.csv"
+    song_scraper.scrape_channels(["UCaaa", "UCbbb"], output_file=str(output_file), incremental=False)
+
+    with open(output_file.parent / "song_timestamps_singing_only.csv", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    channel_by_video = {}
+    for row in rows:
+        channel_by_video.setdefault(row["動画ID"], set()).add(row["チャンネルID"])
+
+    assert channel_by_video == {
+        SHARED_VIDEO_ID: {"UCaaa"},
+        "only_a_0001": {"UCaaa"},
+        "only_b_0001": {"UCbbb"},
+    }
+    # 共有動画の曲は重複除去され、1曲1行になる
+    assert sum(1 for row in rows if row["動画ID"] == SHARED_VIDEO_ID) == 3
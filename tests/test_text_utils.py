@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import text_utils
+from utils.text_utils import KATAKANA_TO_HIRAGANA, SIMPLE_HIRAGANA_TABLE, has_min_timestamps
+
+
+def _old_simple_katakana_to_hiragana(text: str) -> str:
+    """str.translate 化する前の1文字ずつの変換（比較用）"""
+    result = ''
+    for char in text:
+        if 'ァ' <= char <= 'ヶ':
+            result += chr(ord(char) - ord('ァ') + ord('ぁ'))
+        elif char == 'ヵ':
+            result += 'か'
+        elif char == 'ヶ':
+            result += 'け'
+        elif 'A' <= char <= 'Z':
+            result += char.lower()
+        elif char in '０１２３４５６７８９':
+            result += str(ord(char) - ord('０'))
+        elif char in '（）［］｛｝':
+            continue
+        else:
+            result += char
+    return result
+
+
+def _old_mecab_reading_to_hiragana(reading: str) -> str:
+    """str.translate 化する前のMeCab読みの変換（比較用）"""
+    hiragana = ''
+    for char in reading:
+        if 'ァ' <= char <= 'ヶ':
+            hiragana += chr(ord(char) - ord('ァ') + ord('ぁ'))
+        elif char == 'ヵ':
+            hiragana += 'か'
+        elif char == 'ヶ':
+            hiragana += 'け'
+        else:
+            hiragana += char.lower()
+    return hiragana
+
+
+# ASCII・ひらがな・カタカナ・全角英数と括弧を含む範囲
+_SAMPLE_CHARS = ''.join(
+    chr(cp) for cp in (*range(0x20, 0x7F), *range(0x3000, 0x3100), *range(0xFF00, 0xFF60))
+)
+
+
+def test_simple_table_matches_old_conversion():
+    for char in _SAMPLE_CHARS:
+        assert char.translate(SIMPLE_HIRAGANA_TABLE) == _old_simple_katakana_to_hiragana(char), repr(char)
+
+    text = "ＡＢＣカタカナ（テスト）０１２ Song ヴァイオリン"
+    assert text.translate(SIMPLE_HIRAGANA_TABLE) == _old_simple_katakana_to_hiragana(text)
+
+
+def test_katakana_table_matches_old_mecab_conversion():
+    for char in _SAMPLE_CHARS:
+        assert char.translate(KATAKANA_TO_HIRAGANA).lower() == _old_mecab_reading_to_hiragana(char), repr(char)
+
+
+def test_to_hiragana_without_mecab(monkeypatch):
+    monkeypatch.setattr(text_utils, "mecab_reading", None)
+    text_utils.to_hiragana.cache_clear()
+    try:
+        assert text_utils.to_hiragana("マリーゴールド") == "まりーごーるど"
+        assert text_utils.to_hiragana("ＡＢＣ（テスト）") == _old_simple_katakana_to_hiragana("ＡＢＣ（テスト）".lower())
+    finally:
+        text_utils.to_hiragana.cache_clear()
+
+
+@pytest.mark.parametrize("text, minimum, expected", [
+    ("0:10 曲A\n3:20 曲B\n1:02:03 曲C", 3, True),
+    ("0:10 曲A\n3:20 曲B", 3, False),
+    ("タイムスタンプなし", 1, False),
+    ("12:34", 1, True),
+])
+def test_has_min_timestamps(text, minimum, expected):
+    assert has_min_timestamps(text, minimum) is expected
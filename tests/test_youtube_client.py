@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.youtube_client import ThreadLocalClient
+
+
+def test_main_thread_uses_main_client():
+    main_client = object()
+    clients = ThreadLocalClient(main_client, lambda: object())
+    assert clients.get() is main_client
+
+
+def test_one_client_per_worker_thread():
+    main_client = object()
+    built = []
+    lock = threading.Lock()
+
+    def build():
+        client = object()
+        with lock:
+            built.append(client)
+        return client
+
+    clients = ThreadLocalClient(main_client, build)
+    results = []
+    barrier = threading.Barrier(4)
+
+    def worker():
+        # 全スレッドが同時に生存している状態で取得する
+        barrier.wait()
+        first = clients.get()
+        second = clients.get()
+        with lock:
+            results.append((first, second))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # スレッド内では同じクライアントを使い回し、スレッド間では共有しない
+    assert all(first is second for first, second in results)
+    assert len({id(first) for first, _ in results}) == 4
+    assert len(built) == 4
+    assert all(first is not main_client for first, _ in results)